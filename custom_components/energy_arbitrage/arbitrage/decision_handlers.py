@@ -4,6 +4,7 @@ Breaks down complex decision logic into focused, testable components.
 """
 
 import logging
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -19,6 +20,24 @@ from .utils import get_current_ha_time
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _split_action_windows(windows: List[Any], action: str, now: datetime) -> tuple:
+    """One pass over the windows of one action: the current window and all current-or-upcoming ones.
+
+    Uses a single "now" for every window instead of the clock-reading is_current/is_upcoming properties;
+    a window is current or upcoming exactly when it has not ended yet.
+    """
+    current = None
+    relevant = []
+    for w in windows:
+        if w.action != action or w.end_time <= now:
+            continue
+        relevant.append(w)
+        if current is None and w.start_time <= now:
+            current = w
+    return current, relevant
+
+
 @dataclass
 class DecisionContext:
     """Context data for making arbitrage decisions."""
@@ -101,13 +120,12 @@ class TimeCriticalDecisionHandler(DecisionHandler):
                 analysis = context.data.get('analysis', {}) or {}
                 windows = analysis.get('price_windows', []) or []
                 # Find current buy window
-                current_buy_win = next((w for w in windows if getattr(w, 'action', None) == 'buy' and w.is_current), None)
+                now = get_current_ha_time()
+                current_buy_win, future_buy_windows = _split_action_windows(windows, 'buy', now)
                 # Find best (lowest price) buy window for TODAY first; fallback to horizon if none
-                now_date = get_current_ha_time().date()
-                todays = [w for w in windows if getattr(w, 'action', None) == 'buy' and (w.is_current or w.is_upcoming) and w.start_time.date() == now_date]
-                future_buy_windows = todays or [w for w in windows if getattr(w, 'action', None) == 'buy' and (w.is_current or w.is_upcoming)]
-                future_buy_windows.sort(key=lambda w: (w.price, w.start_time))
-                best_future_buy = future_buy_windows[0] if future_buy_windows else None
+                now_date = now.date()
+                future_buy_windows = [w for w in future_buy_windows if w.start_time.date() == now_date] or future_buy_windows
+                best_future_buy = min(future_buy_windows, key=lambda w: (w.price, w.start_time), default=None)
                 # Compute headroom and apply reserve-for-top1 logic
                 battery_capacity = context.current_state.get('battery_capacity', 0.0)
                 current_wh = (battery_level / 100.0) * battery_capacity
@@ -159,13 +177,12 @@ class TimeCriticalDecisionHandler(DecisionHandler):
                 analysis = context.data.get('analysis', {}) or {}
                 windows = analysis.get('price_windows', []) or []
                 # Find current sell window
-                current_sell_win = next((w for w in windows if getattr(w, 'action', None) == 'sell' and w.is_current), None)
+                now = get_current_ha_time()
+                current_sell_win, future_sell_windows = _split_action_windows(windows, 'sell', now)
                 # Find best (highest price) sell window for TODAY first; fallback to horizon if none
-                now_date = get_current_ha_time().date()
-                todays = [w for w in windows if getattr(w, 'action', None) == 'sell' and (w.is_current or w.is_upcoming) and w.start_time.date() == now_date]
-                future_sell_windows = todays or [w for w in windows if getattr(w, 'action', None) == 'sell' and (w.is_current or w.is_upcoming)]
-                future_sell_windows.sort(key=lambda w: (-w.price, w.start_time))
-                best_future_sell = future_sell_windows[0] if future_sell_windows else None
+                now_date = now.date()
+                future_sell_windows = [w for w in future_sell_windows if w.start_time.date() == now_date] or future_sell_windows
+                best_future_sell = min(future_sell_windows, key=lambda w: (-w.price, w.start_time), default=None)
                 # Determine if current is effectively top-1 (within tolerance)
                 if current_sell_win and best_future_sell and (best_future_sell.price <= current_sell_win.price + PRICE_COMPARISON_TOLERANCE):
                     # Current is top-1 → use full 1h capacity
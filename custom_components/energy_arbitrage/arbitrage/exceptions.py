@@ -74,6 +74,9 @@ def safe_execute(default_return: Any = None,
         Decorated function with error handling
     """
     def decorator(func: F) -> F:
+        # Lowercase the name once per decoration, not on every failure branch
+        name_lower = func.__name__.lower()
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
@@ -94,27 +97,27 @@ def safe_execute(default_return: Any = None,
                 
                 if raise_on_error:
                     # Convert to appropriate ArbitrageError subtype
-                    if 'config' in func.__name__.lower():
+                    if 'config' in name_lower:
                         raise ConfigurationError(
                             f"Configuration error in {func.__name__}", 
                             error_details, e
                         ) from e
-                    elif 'sensor' in func.__name__.lower() or 'data' in func.__name__.lower():
+                    elif 'sensor' in name_lower or 'data' in name_lower:
                         raise SensorDataError(
                             f"Sensor data error in {func.__name__}", 
                             error_details, e
                         ) from e
-                    elif 'optim' in func.__name__.lower() or 'calculate' in func.__name__.lower():
+                    elif 'optim' in name_lower or 'calculate' in name_lower:
                         raise OptimizationError(
                             f"Optimization error in {func.__name__}", 
                             error_details, e
                         ) from e
-                    elif 'plan' in func.__name__.lower():
+                    elif 'plan' in name_lower:
                         raise PlanningError(
                             f"Planning error in {func.__name__}", 
                             error_details, e
                         ) from e
-                    elif 'execut' in func.__name__.lower() or 'command' in func.__name__.lower():
+                    elif 'execut' in name_lower or 'command' in name_lower:
                         raise ExecutionError(
                             f"Execution error in {func.__name__}", 
                             error_details, e
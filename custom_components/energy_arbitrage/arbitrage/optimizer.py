@@ -4,10 +4,7 @@ from .utils import get_current_ha_time
 from typing import Dict, Any, List, Optional
 from ..const import CONF_CURRENCY, DEFAULT_CURRENCY
 
-from .sensor_data_helper import SensorDataHelper
 from .exceptions import safe_execute, OptimizationError, log_performance
-from .predictor import EnergyBalancePredictor
-from .time_analyzer import TimeWindowAnalyzer
 from .decision_handlers import (
     DecisionContext, DecisionResult,
     TimeCriticalDecisionHandler, HoldDecisionHandler
@@ -30,9 +27,9 @@ _LOGGER = logging.getLogger(__name__)
 class ArbitrageOptimizer:
     def __init__(self, coordinator):
         self.coordinator = coordinator
-        self.sensor_helper = SensorDataHelper(coordinator.hass, coordinator.entry.entry_id, coordinator)
-        self.energy_predictor = EnergyBalancePredictor(self.sensor_helper)
-        self.time_analyzer = TimeWindowAnalyzer(self.sensor_helper)
+        # Reuse the coordinator's shared helpers instead of building a private set
+        self.sensor_helper = coordinator.sensor_helper
+        self.time_analyzer = coordinator.time_analyzer
         self._last_plan_update = None
         self._last_trade_ts = {'sell': None, 'buy': None}
         self._last_action: Optional[str] = None  # 'sell' | 'buy' | None
@@ -133,6 +130,12 @@ class ArbitrageOptimizer:
         # Get configuration from sensors
         min_margin = self.sensor_helper.get_min_arbitrage_margin()
         battery_efficiency = self.sensor_helper.get_battery_efficiency()
+        # Battery specs and degradation flag resolved once for all opportunity checks below;
+        # config/options come from this refresh's data (coordinator.data is None on the first refresh)
+        config = data.get('config') or {}
+        options = data.get('options') or {}
+        battery_specs = self._get_battery_specs(config, options)
+        include_degradation = options.get('include_degradation', config.get('include_degradation', True))
         
         opportunities = []
         
@@ -142,12 +145,6 @@ class ArbitrageOptimizer:
         # Sell now, rebuy later at forecast minimum
         roi_sell_rebuy = self.sensor_helper.get_arbitrage_roi(min_buy_price_24h, current_sell_price)
         if roi_sell_rebuy >= min_margin:
-            battery_specs = self._get_battery_specs(
-                self.sensor_helper.coordinator.data.get('config', {}),
-                self.sensor_helper.coordinator.data.get('options', {})
-            )
-            include_degradation = self.sensor_helper.coordinator.data.get('options', {}).get('include_degradation', 
-                                self.sensor_helper.coordinator.data.get('config', {}).get('include_degradation', True))
             energy_amount_wh = ENERGY_CALCULATION_1KWH
             profit_details = calculate_arbitrage_profit(
                 min_buy_price_24h, current_sell_price, energy_amount_wh,
@@ -171,12 +168,6 @@ class ArbitrageOptimizer:
         # Buy now, sell later at forecast maximum
         roi_buy_sell = self.sensor_helper.get_arbitrage_roi(current_buy_price, max_sell_price_24h)
         if roi_buy_sell >= min_margin:
-            battery_specs = self._get_battery_specs(
-                self.sensor_helper.coordinator.data.get('config', {}),
-                self.sensor_helper.coordinator.data.get('options', {})
-            )
-            include_degradation = self.sensor_helper.coordinator.data.get('options', {}).get('include_degradation', 
-                                self.sensor_helper.coordinator.data.get('config', {}).get('include_degradation', True))
             energy_amount_wh = ENERGY_CALCULATION_1KWH
             profit_details = calculate_arbitrage_profit(
                 current_buy_price, max_sell_price_24h, energy_amount_wh,
@@ -203,13 +194,6 @@ class ArbitrageOptimizer:
             
             if roi >= min_margin:
                 # Calculate detailed profit with degradation for future opportunity
-                battery_specs = self._get_battery_specs(
-                    self.sensor_helper.coordinator.data.get('config', {}),
-                    self.sensor_helper.coordinator.data.get('options', {})
-                )
-                include_degradation = self.sensor_helper.coordinator.data.get('options', {}).get('include_degradation', 
-                                    self.sensor_helper.coordinator.data.get('config', {}).get('include_degradation', True))
-                
                 # Assume 1kWh transaction for calculation
                 energy_amount_wh = ENERGY_CALCULATION_1KWH  # 1 kWh in Wh
                 profit_details = calculate_arbitrage_profit(
@@ -308,18 +292,19 @@ class ArbitrageOptimizer:
         # Process through decision handlers in priority order
         for handler in self.decision_handlers:
             if handler.can_handle(context):
-                _LOGGER.debug(f"Using {handler.__class__.__name__} for decision")
+                _LOGGER.debug("Using %s for decision", handler.__class__.__name__)
                 decision = handler.make_decision(context)
                 if decision:
                     # Record cooldown timestamps
                     if decision.action in ['sell_arbitrage', 'charge_arbitrage']:
                         self._last_action = 'sell' if decision.action == 'sell_arbitrage' else 'buy'
                         self._last_trade_ts[self._last_action] = get_current_ha_time().isoformat()
-                    # Centralized debug rationale logging
-                    try:
-                        self._log_decision_rationale(decision, context, handler.__class__.__name__)
-                    except Exception as e:
-                        _LOGGER.debug(f"Failed to log decision rationale: {e}")
+                    # Centralized debug rationale logging (skipped entirely unless DEBUG is enabled)
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        try:
+                            self._log_decision_rationale(decision, context, handler.__class__.__name__)
+                        except Exception as e:
+                            _LOGGER.debug("Failed to log decision rationale: %s", e)
                     return self._convert_decision_to_dict(decision)
         
         # Fallback - should never reach here due to HoldDecisionHandler
@@ -349,8 +334,8 @@ class ArbitrageOptimizer:
         opp = decision.opportunity or {}
 
         # Summarize schedules
-        has_sell_now = any(getattr(getattr(op, 'window', None), 'is_current', False) for op in best_sell_schedule)
-        has_buy_now = any(getattr(getattr(op, 'window', None), 'is_current', False) for op in best_buy_schedule)
+        has_sell_now = any(op.window.is_current for op in best_sell_schedule)
+        has_buy_now = any(op.window.is_current for op in best_buy_schedule)
 
         _LOGGER.debug(
             "DECISION RATIONALE | handler=%s | action=%s | reason=%s | strategy=%s | plan=%s | completion=%s\n"
@@ -361,8 +346,8 @@ class ArbitrageOptimizer:
             decision.action,
             decision.reason,
             decision.strategy,
-            getattr(decision, 'plan_status', None),
-            getattr(decision, 'completion_time', None),
+            decision.plan_status,
+            decision.completion_time,
             cs.get('battery_level', 0.0),
             cs.get('min_reserve_percent', 0.0),
             int(cs.get('pv_power', 0.0)),
@@ -386,18 +371,18 @@ class ArbitrageOptimizer:
         """Gather all analysis data needed for decision making."""
         
         # 🧠 PREDICTIVE ANALYSIS
-        try:
-            energy_strategy = self.energy_predictor.assess_battery_strategy(
-                current_state['battery_level'], current_state['battery_capacity']
-            )
-            energy_situation = self.energy_predictor.get_energy_situation_summary()            
-        except Exception as e:
-            _LOGGER.warning(f"Predictive analysis failed, falling back to basic logic: {e}")
+        # Computed once per refresh by the coordinator from this refresh's PV forecast
+        balances = data.get("balances")
+        if balances:
+            energy_strategy = data["battery_strategy"]
+            energy_situation = data["energy_situation"]
+        else:
+            _LOGGER.warning("Predictive analysis unavailable, falling back to basic logic")
             energy_strategy = {
                 'recommendation': 'hold', 
                 'urgency': 'low', 
                 'target_battery_level': current_state['battery_level'],
-                'reason': f"predictive_error: {str(e)}"
+                'reason': "predictive_error: energy forecast unavailable"
             }
             energy_situation = 'unknown'
         
@@ -405,26 +390,31 @@ class ArbitrageOptimizer:
         pv_can_reach_target = False
         pv_storeable_surplus_wh = 0.0
         required_wh_to_target = 0.0
-        try:
-            balances = self.energy_predictor.calculate_combined_balance()
-            # Available PV surplus next 48h
-            pv_surplus_next48 = max(0.0, balances['today'].net_balance_wh) + max(0.0, balances['tomorrow'].net_balance_wh)
-            # Battery headroom
-            battery_capacity = current_state['battery_capacity']
-            current_wh = (current_state['battery_level'] / 100.0) * battery_capacity
-            target_wh = (energy_strategy.get('target_battery_level', current_state['battery_level']) / 100.0) * battery_capacity
-            required_wh_to_target = max(0.0, target_wh - current_wh)
-            headroom_wh = max(0.0, battery_capacity - current_wh)
-            pv_storeable_surplus_wh = max(0.0, min(pv_surplus_next48, headroom_wh))
-            pv_can_reach_target = pv_storeable_surplus_wh >= required_wh_to_target * 0.97  # allow small losses
-        except Exception as e:
-            _LOGGER.debug(f"PV surplus vs target check failed: {e}")
+        if balances:
+            try:
+                # Available PV surplus next 48h
+                pv_surplus_next48 = max(0.0, balances['today'].net_balance_wh) + max(0.0, balances['tomorrow'].net_balance_wh)
+                # Battery headroom
+                battery_capacity = current_state['battery_capacity']
+                current_wh = (current_state['battery_level'] / 100.0) * battery_capacity
+                target_wh = (energy_strategy.get('target_battery_level', current_state['battery_level']) / 100.0) * battery_capacity
+                required_wh_to_target = max(0.0, target_wh - current_wh)
+                headroom_wh = max(0.0, battery_capacity - current_wh)
+                pv_storeable_surplus_wh = max(0.0, min(pv_surplus_next48, headroom_wh))
+                pv_can_reach_target = pv_storeable_surplus_wh >= required_wh_to_target * 0.97  # allow small losses
+            except Exception as e:
+                _LOGGER.debug(f"PV surplus vs target check failed: {e}")
         
         # 🕐 TIME WINDOW ANALYSIS  
         try:
             planning_horizon = data.get("planning_horizon", PRICE_ANALYSIS_24H_WINDOW)
-            price_windows = self.time_analyzer.analyze_price_windows(data.get("price_data", {}), planning_horizon)
-            price_situation = self.time_analyzer.get_current_price_situation(price_windows)
+            if planning_horizon == PRICE_ANALYSIS_24H_WINDOW and "price_windows" in data:
+                # Already analyzed by the coordinator for this refresh
+                price_windows = data["price_windows"]
+                price_situation = data["price_situation"]
+            else:
+                price_windows = self.time_analyzer.analyze_price_windows(data.get("price_data", {}), planning_horizon)
+                price_situation = self.time_analyzer.get_current_price_situation(price_windows)
             # 🏆 BEST-OF-BEST SELL SCHEDULE
             try:
                 best_sell_schedule = self.time_analyzer.plan_best_sell_schedule(
@@ -544,16 +534,12 @@ class ArbitrageOptimizer:
     # Removed unused helper _is_current_time_window to reduce dead code
 
     def _get_battery_specs(self, config: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, float]:
-        # Get coordinator data for static config parameters  
-        coordinator_config = self.sensor_helper.coordinator.data.get('config', {})
-        coordinator_options = self.sensor_helper.coordinator.data.get('options', {})
-        # Note: config and options parameters kept for API compatibility but using coordinator data
-        
+        # Static battery parameters from the config/options passed in (options win)
         return {
             'capacity': self.sensor_helper.get_battery_capacity(),  # Get current capacity from coordinator via sensor_helper
-            'cost': coordinator_options.get('battery_cost', coordinator_config.get('battery_cost', DEFAULT_BATTERY_COST)),
-            'cycles': coordinator_options.get('battery_cycles', coordinator_config.get('battery_cycles', DEFAULT_BATTERY_CYCLES)),
-            'degradation_factor': coordinator_options.get('degradation_factor', coordinator_config.get('degradation_factor', DEFAULT_DEGRADATION_FACTOR))
+            'cost': options.get('battery_cost', config.get('battery_cost', DEFAULT_BATTERY_COST)),
+            'cycles': options.get('battery_cycles', config.get('battery_cycles', DEFAULT_BATTERY_CYCLES)),
+            'degradation_factor': options.get('degradation_factor', config.get('degradation_factor', DEFAULT_DEGRADATION_FACTOR))
         }
 
 
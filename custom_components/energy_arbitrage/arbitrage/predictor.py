@@ -11,7 +11,7 @@ from dataclasses import dataclass
 
 _LOGGER = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class EnergyBalance:
     """Energy balance result for a specific period."""
     period: str                    # "today" | "tomorrow" | "next_24h"
@@ -54,17 +54,22 @@ class EnergyBalancePredictor:
         self._consumption_history = []  # Will store historical data
         self._default_hourly_consumption = 750  # 750W average (18kWh/day)
         
-    def calculate_energy_balance_today(self) -> EnergyBalance:
-        """Calculate energy balance for remainder of today."""
+    def calculate_energy_balance_today(
+        self,
+        pv_forecast_wh: Optional[float] = None,
+        pv_details: Optional[Dict[str, Any]] = None
+    ) -> EnergyBalance:
+        """Calculate energy balance for remainder of today.
+        
+        Pass the PV forecast to skip reading it back from the PV forecast sensor.
+        """
         # FIXED: Use HA timezone instead of system timezone
         now = get_current_ha_time()
         
         # Get PV forecast for today
-        pv_forecast_wh = self.sensor_helper.get_pv_forecast_today()
-        pv_details = self.sensor_helper.get_pv_forecast_today_details()
-        
-        # Calculate remaining hours today
-        hours_remaining = 24 - now.hour
+        if pv_forecast_wh is None:
+            pv_forecast_wh = self.sensor_helper.get_pv_forecast_today()
+            pv_details = self.sensor_helper.get_pv_forecast_today_details()
         
         # Estimate remaining consumption today
         consumption_forecast_wh = self._estimate_consumption_remaining_today(now)
@@ -84,11 +89,12 @@ class EnergyBalancePredictor:
             confidence=0.8  # High confidence for current day
         )
     
-    def calculate_energy_balance_tomorrow(self) -> EnergyBalance:
+    def calculate_energy_balance_tomorrow(self, pv_forecast_wh: Optional[float] = None) -> EnergyBalance:
         """Calculate energy balance for tomorrow."""
         
         # Get PV forecast for tomorrow
-        pv_forecast_wh = self.sensor_helper.get_pv_forecast_tomorrow()
+        if pv_forecast_wh is None:
+            pv_forecast_wh = self.sensor_helper.get_pv_forecast_tomorrow()
         
         # Estimate full day consumption (24 hours)
         consumption_forecast_wh = self._estimate_daily_consumption()
@@ -105,11 +111,19 @@ class EnergyBalancePredictor:
             confidence=0.7  # Medium confidence for next day
         )
     
-    def calculate_combined_balance(self) -> Dict[str, EnergyBalance]:
-        """Calculate energy balances for multiple periods."""
+    def calculate_combined_balance(
+        self,
+        pv_today_wh: Optional[float] = None,
+        pv_tomorrow_wh: Optional[float] = None,
+        pv_today_details: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, EnergyBalance]:
+        """Calculate energy balances for multiple periods.
+        
+        PV values that are not passed are read from the PV forecast sensors.
+        """
         
-        today_balance = self.calculate_energy_balance_today()
-        tomorrow_balance = self.calculate_energy_balance_tomorrow()
+        today_balance = self.calculate_energy_balance_today(pv_today_wh, pv_today_details)
+        tomorrow_balance = self.calculate_energy_balance_tomorrow(pv_tomorrow_wh)
         
         # Calculate 48-hour outlook
         total_pv = today_balance.pv_forecast_wh + tomorrow_balance.pv_forecast_wh
@@ -130,10 +144,19 @@ class EnergyBalancePredictor:
             'next_48h': combined_balance
         }
     
-    def assess_battery_strategy(self, current_battery_level: float, battery_capacity_wh: float) -> Dict[str, Any]:
-        """Assess optimal battery strategy based on energy forecasts."""
+    def assess_battery_strategy(
+        self,
+        current_battery_level: float,
+        battery_capacity_wh: float,
+        balances: Optional[Dict[str, EnergyBalance]] = None
+    ) -> Dict[str, Any]:
+        """Assess optimal battery strategy based on energy forecasts.
         
-        balances = self.calculate_combined_balance()
+        Pass precomputed balances to avoid recalculating them.
+        """
+        
+        if balances is None:
+            balances = self.calculate_combined_balance()
         current_battery_wh = (current_battery_level / 100) * battery_capacity_wh
         
         today = balances['today']
@@ -193,8 +216,6 @@ class EnergyBalancePredictor:
     
     def _estimate_consumption_remaining_today(self, now: datetime) -> float:
         """Estimate consumption for remainder of today."""
-        hours_remaining = 24 - now.hour
-        
         # Simple model: higher consumption in evening hours
         hourly_patterns = {
             0: 0.6, 1: 0.5, 2: 0.5, 3: 0.5, 4: 0.5, 5: 0.6,
@@ -239,9 +260,10 @@ class EnergyBalancePredictor:
             hours_of_sun_remaining = max(0, 20 - current_hour)
             return total_pv_wh * (hours_of_sun_remaining / 14)  # 14 hours of daylight
     
-    def get_energy_situation_summary(self) -> str:
+    def get_energy_situation_summary(self, balances: Optional[Dict[str, EnergyBalance]] = None) -> str:
         """Get human-readable summary of energy situation."""
-        balances = self.calculate_combined_balance()
+        if balances is None:
+            balances = self.calculate_combined_balance()
         
         today = balances['today']
         tomorrow = balances['tomorrow']
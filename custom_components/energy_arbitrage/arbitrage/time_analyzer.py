@@ -3,6 +3,7 @@ Time Window Analyzer for optimal arbitrage timing.
 Analyzes price data to find optimal buy/sell windows with time constraints.
 """
 
+import heapq
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
@@ -15,7 +16,15 @@ from .exceptions import safe_execute, log_performance
 
 _LOGGER = logging.getLogger(__name__)
 
-@dataclass
+
+def _format_window_preview(windows) -> str:
+    """Join a few windows into a compact 'action HH:MM-HH:MM @ price' list for debug logs."""
+    return ", ".join(
+        f"{w.action} {w.start_time.strftime('%H:%M')}-{w.end_time.strftime('%H:%M')} @ {w.price:.4f}"
+        for w in windows
+    )
+
+@dataclass(slots=True)
 class PriceWindow:
     """Represents a time window for price-based operations."""
     action: str                    # "buy" | "sell" 
@@ -62,7 +71,7 @@ class PriceWindow:
         return battery_power_w * self.duration_hours  # Wh
 
 
-@dataclass
+@dataclass(slots=True)
 class BatteryOperation:
     """Planned battery operation with timing."""
     action: str                   # "charge" | "discharge"
@@ -107,33 +116,40 @@ class TimeWindowAnalyzer:
         def _normalize(points: List[Dict]) -> List[tuple[datetime, datetime, float]]:
             normalized: List[tuple[datetime, datetime, float]] = []
             for p in points:
+                # Validate up front: parse_datetime only handles strings (it raises on e.g. epoch ints)
+                if not isinstance(p, dict):
+                    continue
+                start_raw = p.get('start')
+                if not isinstance(start_raw, str):
+                    continue
+                start = parse_datetime(start_raw)
+                if not start:
+                    continue
+                end_raw = p.get('end')
+                if end_raw and not isinstance(end_raw, str):
+                    continue
+                end = parse_datetime(end_raw) if end_raw else start + timedelta(hours=1)
+                value = p.get('value')
+                if end is None or value is None:
+                    continue
+                # Filter to horizon, include current or future hours; skip empty/inverted periods
+                if end <= now or start > horizon or end <= start:
+                    continue
+                # Only the numeric conversion can fail
                 try:
-                    start = parse_datetime(p.get('start', ''))
-                    end = parse_datetime(p.get('end', '')) if p.get('end') else (start + timedelta(hours=1) if start else None)
-                    value = p.get('value', None)
-                    if not start or end is None or value is None:
-                        continue
-                    # Filter to horizon, include current or future hours
-                    if (end <= now) or (start > horizon):
-                        continue
-                    # Clamp to 1h blocks
-                    duration_h = (end - start).total_seconds() / 3600.0
-                    if duration_h <= 0:
-                        continue
-                    normalized.append((start, end, float(value)))
-                except Exception:
+                    price = float(value)
+                except (ValueError, TypeError):
                     continue
+                normalized.append((start, end, price))
             return normalized
 
         norm_buy = _normalize(buy_prices)
         norm_sell = _normalize(sell_prices)
 
-        # Select top-N by price with deterministic tiebreaker (earlier start first)
-        norm_sell.sort(key=lambda x: (-x[2], x[0]))
-        norm_buy.sort(key=lambda x: (x[2], x[0]))
-
-        top_sell = norm_sell[: self._top_n_slots]
-        top_buy = norm_buy[: self._top_n_slots]
+        # Select top-N by price with deterministic tiebreaker (earlier start first);
+        # nsmallest keeps only N candidates instead of sorting the whole horizon
+        top_sell = heapq.nsmallest(self._top_n_slots, norm_sell, key=lambda x: (-x[2], x[0]))
+        top_buy = heapq.nsmallest(self._top_n_slots, norm_buy, key=lambda x: (x[2], x[0]))
 
         def _make_window(action: str, start: datetime, end: datetime, price: float) -> PriceWindow:
             duration = max(0.0, (end - start).total_seconds() / 3600.0)
@@ -240,33 +256,26 @@ class TimeWindowAnalyzer:
     
     def get_current_price_situation(self, windows: List[PriceWindow]) -> Dict[str, Any]:
         """Analyze current price situation and upcoming opportunities."""
-        # Debug: log current HA time for alignment checks
         now = get_current_ha_time()
-        _LOGGER.debug(f"PriceSituation now: {now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
 
-        # Find current windows
-        current_windows = [w for w in windows if w.is_current]
-        upcoming_windows = [w for w in windows if w.is_upcoming]
+        # Single pass: split into current and upcoming windows against the same "now"
+        current_windows = []
+        upcoming_windows = []
+        for w in windows:
+            start = w.start_time
+            if now < start:
+                upcoming_windows.append(w)
+            elif now < w.end_time:
+                current_windows.append(w)
 
-        # Debug: log first two current and upcoming windows
-        if current_windows:
-            try:
-                cur_preview = ", ".join(
-                    f"{w.action} {w.start_time.strftime('%H:%M')}-{w.end_time.strftime('%H:%M')} @ {w.price:.4f}"
-                    for w in current_windows[:2]
-                )
-                _LOGGER.debug(f"Current windows ({len(current_windows)}): {cur_preview}")
-            except Exception:
-                pass
-        if upcoming_windows:
-            try:
-                up_preview = ", ".join(
-                    f"{w.action} {w.start_time.strftime('%H:%M')}-{w.end_time.strftime('%H:%M')} @ {w.price:.4f}"
-                    for w in upcoming_windows[:2]
-                )
-                _LOGGER.debug(f"Upcoming windows ({len(upcoming_windows)}): {up_preview}")
-            except Exception:
-                pass
+        # Debug: log current HA time and the first two current/upcoming windows;
+        # strftime and the previews are only built when DEBUG is actually enabled
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("PriceSituation now: %s", now.strftime('%Y-%m-%d %H:%M:%S %Z'))
+            if current_windows:
+                _LOGGER.debug("Current windows (%d): %s", len(current_windows), _format_window_preview(current_windows[:2]))
+            if upcoming_windows:
+                _LOGGER.debug("Upcoming windows (%d): %s", len(upcoming_windows), _format_window_preview(upcoming_windows[:2]))
         
         # Sort upcoming by start time
         upcoming_windows.sort(key=lambda w: w.start_time)
@@ -285,30 +294,33 @@ class TimeWindowAnalyzer:
             current_windows.sort(key=lambda w: (w.urgency != 'high', w.price if w.action == 'sell' else -w.price))
             
             best_current = current_windows[0]
+            # time_remaining is a computed property; evaluate it once
+            remaining_s = best_current.time_remaining.total_seconds()
             situation['immediate_action'] = {
                 'action': best_current.action,
                 'price': best_current.price,
-                'time_remaining': best_current.time_remaining.total_seconds() / 3600,
+                'time_remaining': remaining_s / 3600,
                 'urgency': best_current.urgency
             }
             
             # High time pressure if current window ends soon
-            if best_current.time_remaining.total_seconds() < SECONDS_PER_HOUR:  # < 1 hour
+            if remaining_s < SECONDS_PER_HOUR:  # < 1 hour
                 situation['time_pressure'] = 'high'
         
         # Check upcoming windows
         if upcoming_windows:
             next_window = upcoming_windows[0]
+            until_start_s = next_window.time_until_start.total_seconds()
             situation['next_opportunity'] = {
                 'action': next_window.action,
                 'price': next_window.price,
-                'time_until_start': next_window.time_until_start.total_seconds() / 3600,
+                'time_until_start': until_start_s / 3600,
                 'duration': next_window.duration_hours,
                 'urgency': next_window.urgency
             }
             
             # Medium pressure if next opportunity is soon
-            if next_window.time_until_start.total_seconds() < (2 * SECONDS_PER_HOUR):  # < 2 hours
+            if until_start_s < (2 * SECONDS_PER_HOUR):  # < 2 hours
                 situation['time_pressure'] = max(situation['time_pressure'], 'medium')
         
         return situation
@@ -391,7 +403,7 @@ class TimeWindowAnalyzer:
         - Optionally shifts start to peak times within each window
         """
         try:
-            sell_windows = [w for w in windows if getattr(w, 'action', None) == 'sell']
+            sell_windows = [w for w in windows if w.action == 'sell']
             if not sell_windows or available_battery_wh <= 0 or max_power_w <= 0:
                 return []
             
@@ -403,16 +415,19 @@ class TimeWindowAnalyzer:
             chrono_windows = sorted(sell_windows, key=lambda w: w.start_time)
             remaining_wh = max(0.0, available_battery_wh)
             planned_ops: List[BatteryOperation] = []
+            # Per-window prices and capacities computed once for the reservation sums below
+            prices = [w.price for w in chrono_windows]
+            capacities = [max_power_w * max(0.0, w.duration_hours) for w in chrono_windows]
 
             for idx, window in enumerate(chrono_windows):
                 if remaining_wh <= 0:
                     break
-                window_capacity_wh = max_power_w * max(0.0, window.duration_hours)
+                window_capacity_wh = capacities[idx]
                 if window_capacity_wh <= 0:
                     continue
                 # Reserve energy for any future windows with higher prices
-                future_better = [w for w in chrono_windows[idx+1:] if w.price > window.price]
-                reserved_wh = sum(max_power_w * max(0.0, w.duration_hours) for w in future_better)
+                price = prices[idx]
+                reserved_wh = sum(c for p, c in zip(prices[idx+1:], capacities[idx+1:]) if p > price)
                 allocatable_wh = max(0.0, remaining_wh - reserved_wh)
                 allocate_wh = min(allocatable_wh, window_capacity_wh)
                 if allocate_wh < 100:  # ignore tiny fragments
@@ -422,7 +437,6 @@ class TimeWindowAnalyzer:
                 duration_hours = allocate_wh / max(1.0, target_power_w)
                 
                 # Simplified: operate from window start
-                optimal_start = window.start_time
                 completion_time = window.start_time + timedelta(hours=duration_hours)
                 
                 planned_ops.append(BatteryOperation(
@@ -467,7 +481,7 @@ class TimeWindowAnalyzer:
         - Shifts to intrawindow lowest price times where possible
         """
         try:
-            buy_windows = [w for w in windows if getattr(w, 'action', None) == 'buy']
+            buy_windows = [w for w in windows if w.action == 'buy']
             if not buy_windows or headroom_wh <= 0 or max_power_w <= 0:
                 return []
             
@@ -478,16 +492,19 @@ class TimeWindowAnalyzer:
             chrono_windows = sorted(buy_windows, key=lambda w: w.start_time)
             remaining_wh = max(0.0, headroom_wh)
             planned_ops: List[BatteryOperation] = []
+            # Per-window prices and capacities computed once for the reservation sums below
+            prices = [w.price for w in chrono_windows]
+            capacities = [max_power_w * max(0.0, w.duration_hours) for w in chrono_windows]
 
             for idx, window in enumerate(chrono_windows):
                 if remaining_wh <= 0:
                     break
-                window_capacity_wh = max_power_w * max(0.0, window.duration_hours)
+                window_capacity_wh = capacities[idx]
                 if window_capacity_wh <= 0:
                     continue
                 # Reserve headroom for any future windows with lower prices (better)
-                future_better = [w for w in chrono_windows[idx+1:] if w.price < window.price]
-                reserved_wh = sum(max_power_w * max(0.0, w.duration_hours) for w in future_better)
+                price = prices[idx]
+                reserved_wh = sum(c for p, c in zip(prices[idx+1:], capacities[idx+1:]) if p < price)
                 allocatable_wh = max(0.0, remaining_wh - reserved_wh)
                 allocate_wh = min(allocatable_wh, window_capacity_wh)
                 if allocate_wh < 100:
@@ -496,7 +513,6 @@ class TimeWindowAnalyzer:
                 duration_hours = allocate_wh / max(1.0, target_power_w)
                 
                 # Simplified: operate from window start
-                optimal_start = window.start_time
                 completion_time = window.start_time + timedelta(hours=duration_hours)
                 
                 planned_ops.append(BatteryOperation(
@@ -9,6 +9,9 @@ _ha_timezone_cache = None
 
 _LOGGER = logging.getLogger(__name__)
 
+# State values treated as "no reading" by safe_float/safe_int (hashed lookup, not a list scan)
+_UNAVAILABLE_VALUES = frozenset({'unknown', 'unavailable', '', None})
+
 def set_global_hass(hass):
     """Set global HA reference during integration setup."""
     global _global_hass, _ha_timezone_cache
@@ -37,6 +40,10 @@ def get_ha_timezone() -> timezone:
     """
     global _global_hass, _ha_timezone_cache
     
+    # Fast path: cached zone, no config probing on every clock read
+    if _ha_timezone_cache is not None:
+        return _ha_timezone_cache
+    
     if _global_hass is None:
         raise RuntimeError("Global HA reference not set - call set_global_hass() during integration setup")
     
@@ -45,9 +52,8 @@ def get_ha_timezone() -> timezone:
     
     try:
         # Cache the timezone to avoid repeated zoneinfo calls
-        if _ha_timezone_cache is None:
-            _ha_timezone_cache = zoneinfo.ZoneInfo(_global_hass.config.time_zone)
-            _LOGGER.debug(f"Cached HA timezone: {_global_hass.config.time_zone}")
+        _ha_timezone_cache = zoneinfo.ZoneInfo(_global_hass.config.time_zone)
+        _LOGGER.debug(f"Cached HA timezone: {_global_hass.config.time_zone}")
         return _ha_timezone_cache
     except Exception as e:
         raise RuntimeError(f"Failed to create timezone from '{_global_hass.config.time_zone}': {e}") from e
@@ -62,7 +68,7 @@ def safe_float(state, default: float = 0.0) -> float:
         else:
             value = state
             
-        if value in ['unknown', 'unavailable', '', None]:
+        if value in _UNAVAILABLE_VALUES:
             return default
             
         return float(value)
@@ -79,7 +85,7 @@ def safe_int(state, default: int = 0) -> int:
         else:
             value = state
             
-        if value in ['unknown', 'unavailable', '', None]:
+        if value in _UNAVAILABLE_VALUES:
             return default
             
         return int(float(value))
@@ -169,6 +175,69 @@ def get_current_price_data(price_data: List[Dict], current_time: datetime = None
     return None
 
 
+# Known per-entry power keys of Solcast-style forecasts, in priority order
+PV_FORECAST_KEYS = ('pv_estimate', 'pv_estimate_10', 'pv_estimate_90', 'forecast', 'value', 'power')
+
+
+def extract_pv_power(entry: Any, _keys=PV_FORECAST_KEYS, _float=float, _isinstance=isinstance) -> Optional[float]:
+    """Return the power value of one forecast entry, or None for unsupported entries."""
+    if _isinstance(entry, dict):
+        for key in _keys:
+            value = entry.get(key)
+            if value:
+                return _float(value)
+        return 0.0
+    if _isinstance(entry, (int, float)):
+        return _float(entry)
+    return None
+
+
+def summarize_pv_forecast(forecast: List) -> Dict[str, Any]:
+    """Peak, total and format of a PV forecast list in a single pass."""
+    if not forecast:
+        return {"forecast_points": 0, "status": "No forecast data"}
+    
+    # Detect the power key once from the first entry instead of probing every row
+    first = forecast[0]
+    key = next((k for k in PV_FORECAST_KEYS if k in first), None) if isinstance(first, dict) else None
+    
+    def _power(entry: Any) -> Optional[float]:
+        # Rows whose value cannot be converted (e.g. 'n/a') are skipped, not fatal
+        try:
+            if key is not None and isinstance(entry, dict):
+                return float(entry.get(key) or 0.0)
+            return extract_pv_power(entry)
+        except (ValueError, TypeError):
+            return None
+    
+    values = map(_power, forecast)
+    
+    max_power = 0.0
+    max_index = 0
+    total = 0.0
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        total += value
+        if value > max_power:
+            max_power = value
+            max_index = i
+    
+    # Try to get period_end from the max power entry
+    peak_hour = ""
+    peak_entry = forecast[max_index]
+    if isinstance(peak_entry, dict):
+        peak_hour = peak_entry.get('period_end', '') or peak_entry.get('datetime', '') or peak_entry.get('time', '')
+    
+    return {
+        "forecast_points": len(forecast),
+        "peak_hour": peak_hour,
+        "peak_power": round(max_power, 3),
+        "total_forecast": round(total, 2),
+        "data_format": "dict" if isinstance(first, dict) else "numeric"
+    }
+
+
 def calculate_battery_degradation_cost(
     energy_amount_wh: float,
     battery_capacity_wh: float,
@@ -6,7 +6,9 @@ import zoneinfo
 from typing import Any, Dict, Optional
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 import homeassistant.components.mqtt as mqtt
 
@@ -40,10 +42,16 @@ from .const import (
     WORK_MODE_ZERO_EXPORT,
 )
 from .arbitrage.optimizer import ArbitrageOptimizer
+from .arbitrage.sensor_data_helper import SensorDataHelper
+from .arbitrage.predictor import EnergyBalancePredictor
+from .arbitrage.time_analyzer import TimeWindowAnalyzer
 from .arbitrage.executor import ArbitrageExecutor
 from .arbitrage.config_manager import ConfigManager
 from .arbitrage.exceptions import safe_execute, log_performance
-from .arbitrage.utils import safe_float, safe_int, parse_datetime, get_ha_timezone, get_current_ha_time
+from .arbitrage.constants import FALLBACK_BATTERY_CAPACITY_WH, PRICE_ANALYSIS_24H_WINDOW
+from .arbitrage.utils import (
+    safe_float, safe_int, parse_datetime, get_current_ha_time, summarize_pv_forecast
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -70,6 +78,20 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
             always_update=False,  # Avoid unnecessary updates when data hasn't changed
         )
         
+        # Device shared by every entity of this entry
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Energy Arbitrage",
+            manufacturer="Custom",
+            model="Energy Arbitrage System",
+            sw_version="1.0.0",
+        )
+        
+        # Shared analysis helpers: one instance per coordinator, reused by the optimizer and all sensors
+        self.sensor_helper = SensorDataHelper(hass, entry.entry_id, self)
+        self.energy_predictor = EnergyBalancePredictor(self.sensor_helper)
+        self.time_analyzer = TimeWindowAnalyzer(self.sensor_helper)
+        
         self.optimizer = ArbitrageOptimizer(self)
         self.executor = ArbitrageExecutor(self)
         
@@ -78,6 +100,11 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
             "sell_prices": [],
             "last_updated": None
         }
+        # Per price list lookup structures, rebuilt whenever a price list arrives over MQTT
+        self._price_index: Dict[str, Dict[str, Any]] = {
+            "buy": self._build_price_index([]),
+            "sell": self._build_price_index([]),
+        }
         
         self._mqtt_unsubs = []
         self._enabled = True
@@ -85,54 +112,94 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
         self._force_charge = False
         self._manual_override_until = None
         
+        # Time of the last completed refresh (HA timezone) and its cached ISO string for sensors
+        self.last_update_time: Optional[datetime] = None
+        self.last_update_iso: Optional[str] = None
+        
         # Performance optimization: Cache frequently accessed data
         self._price_cache = {}
         self._price_cache_timeout = 300  # 5 minutes cache timeout
 
     async def async_setup(self):
         await self._subscribe_mqtt_topics()
-            
-    def _find_current_price_entry(self, price_data: list) -> dict:
-        """Find the current price entry based on start/end timestamps using HA timezone."""
-        if not price_data:
-            return {}
         
-        # Use already imported functions
+        # Refresh when the Solcast daily totals change instead of re-reading them on every sensor read
+        pv_forecast_entities = [
+            entity_id for entity_id in (
+                self.config.get(CONF_PV_FORECAST_TODAY_SENSOR),
+                self.config.get(CONF_PV_FORECAST_TOMORROW_SENSOR),
+            ) if entity_id
+        ]
+        if pv_forecast_entities:
+            self.entry.async_on_unload(
+                async_track_state_change_event(self.hass, pv_forecast_entities, self._handle_pv_forecast_change)
+            )
+
+    @callback
+    def _handle_pv_forecast_change(self, event: Event) -> None:
+        _LOGGER.debug("PV forecast changed: %s", event.data['entity_id'])
+        self.hass.async_create_task(self.async_request_refresh())
+            
+    def _find_current_price_index(self, kind: str) -> Optional[int]:
+        """Index of the current entry of one price list ("buy" or "sell"), first entry if none matches."""
+        index = self._price_index[kind]
+        if not index["entries"]:
+            return None
         
         # Get current time in HA timezone 
-        ha_tz = get_ha_timezone()
-        current_time = datetime.now(ha_tz)
+        current_time = get_current_ha_time()
         
-        for entry in price_data:
-            try:
-                # Parse using the unified function that converts to HA timezone
-                start_time = parse_datetime(entry.get('start', ''))
-                end_time = parse_datetime(entry.get('end', ''))
-                
-                if not start_time or not end_time:
-                    continue
-                                
-                if start_time <= current_time < end_time:
-                    return entry
-                    
-            except (KeyError, ValueError) as e:
-                _LOGGER.debug(f"Invalid price entry format: {e}")
-                continue
+        # Start/end times were parsed once when the price list arrived
+        for i, (start_time, end_time) in enumerate(zip(index["starts"], index["ends"])):
+            if start_time and end_time and start_time <= current_time < end_time:
+                return i
         
-        _LOGGER.warning(f"No current price period found at {current_time.strftime('%H:%M')}, using first entry if available")
-        return price_data[0] if price_data else {}
+        _LOGGER.warning("No current price period found at %s, using first entry if available", current_time.strftime('%H:%M'))
+        return 0
+
+    def _find_current_price_entry(self, kind: str) -> dict:
+        """Find the current price entry of one price list ("buy" or "sell") using HA timezone."""
+        i = self._find_current_price_index(kind)
+        return self._price_index[kind]["entries"][i] if i is not None else {}
     
     def get_current_buy_price(self) -> float:
         """Get current buy price with proper time matching."""
-        buy_prices = self.price_data.get("buy_prices", [])
-        current_entry = self._find_current_price_entry(buy_prices)
-        return current_entry.get("value", 0.0) or 0.0
+        i = self._find_current_price_index("buy")
+        return self._price_index["buy"]["values"][i] if i is not None else 0.0
     
     def get_current_sell_price(self) -> float:
         """Get current sell price with proper time matching."""
-        sell_prices = self.price_data.get("sell_prices", [])
-        current_entry = self._find_current_price_entry(sell_prices)
-        return current_entry.get("value", 0.0) or 0.0
+        i = self._find_current_price_index("sell")
+        return self._price_index["sell"]["values"][i] if i is not None else 0.0
+
+    def get_next_price_entry(self, kind: str, current_start: str) -> Optional[dict]:
+        """Get the price entry following the one starting at current_start ("buy" or "sell")."""
+        index = self._price_index.get(kind)
+        if not index:
+            return None
+        i = index["by_start"].get(current_start)
+        if i is None or i + 1 >= len(index["entries"]):
+            return None
+        return index["entries"][i + 1]
+
+    @staticmethod
+    def _build_price_index(prices) -> Dict[str, Any]:
+        """Parallel arrays (parsed start/end, value) plus a start -> position map for one price list."""
+        entries = prices if isinstance(prices, list) else []
+        starts, ends, values, by_start = [], [], [], {}
+        for i, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                starts.append(None)
+                ends.append(None)
+                values.append(0.0)
+                continue
+            start = entry.get('start', '')
+            starts.append(parse_datetime(start))
+            ends.append(parse_datetime(entry.get('end', '')))
+            values.append(entry.get("value", 0.0) or 0.0)
+            # Keep the first occurrence, matching the previous linear scan
+            by_start.setdefault(start, i)
+        return {"entries": entries, "starts": starts, "ends": ends, "values": values, "by_start": by_start}
 
     async def _subscribe_mqtt_topics(self):
         buy_topic = self.config.get(CONF_MQTT_BUY_TOPIC, "energy/forecast/buy")
@@ -147,38 +214,44 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
             )
             
             self._mqtt_unsubs = [buy_unsub, sell_unsub]
-            _LOGGER.info(f"✅ Subscribed to MQTT topics: 📊 BUY:  {buy_topic} | 💰 SELL: {sell_topic}")
+            _LOGGER.info("✅ Subscribed to MQTT topics: 📊 BUY:  %s | 💰 SELL: %s", buy_topic, sell_topic)
         except Exception as e:
-            _LOGGER.error(f"❌ Failed to subscribe to MQTT topics: {e}")
+            _LOGGER.error("❌ Failed to subscribe to MQTT topics: %s", e)
 
     @callback
     def _handle_buy_price_message(self, message):
         try:
             data = json.loads(message.payload)
             if isinstance(data, list) and len(data) > 0:
-                _LOGGER.debug(f"First buy price entry: {data[0]}")
+                _LOGGER.debug("First buy price entry: %s", data[0])
             
+            # Index first, so a failed build never pairs the new list with the old index
+            index = self._build_price_index(data)
             self.price_data["buy_prices"] = data
+            self._price_index["buy"] = index
             self.price_data["last_updated"] = get_current_ha_time()
             self.hass.async_create_task(self.async_request_refresh())
         except Exception as e:
-            _LOGGER.error(f"Error parsing buy price message: {e}")
+            _LOGGER.error("Error parsing buy price message: %s", e)
 
     @callback
     def _handle_sell_price_message(self, message):
         try:
-            _LOGGER.info(f"🔥 SELL PRICE MESSAGE RECEIVED! Topic: {message.topic}")
+            _LOGGER.debug("🔥 SELL PRICE MESSAGE RECEIVED! Topic: %s", message.topic)
             data = json.loads(message.payload)
             if isinstance(data, list) and len(data) > 0:
-                _LOGGER.info(f"First sell price entry: {data[0]}")
+                _LOGGER.debug("First sell price entry: %s", data[0])
             
+            # Index first, so a failed build never pairs the new list with the old index
+            index = self._build_price_index(data)
             self.price_data["sell_prices"] = data
+            self._price_index["sell"] = index
             self.price_data["last_updated"] = get_current_ha_time()
             self.hass.async_create_task(self.async_request_refresh())
         except Exception as e:
-            _LOGGER.error(f"❌ Error parsing sell price message: {e}")
-            _LOGGER.error(f"Message topic: {message.topic}")
-            _LOGGER.error(f"Message payload: {message.payload}")
+            _LOGGER.error("❌ Error parsing sell price message: %s", e)
+            _LOGGER.error("Message topic: %s", message.topic)
+            _LOGGER.error("Message payload: %s", message.payload)
 
     @safe_execute(default_return={
         "decision": {"action": "hold", "reason": "Update failed - safe mode"},
@@ -192,6 +265,11 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
         import asyncio
         async with asyncio.timeout(30):  # 30 second timeout for safety
             data = await self._collect_sensor_data()
+            # 24h price windows for the sensors and the optimizer, analyzed once per refresh
+            data.update(self._compute_price_windows(data))
+            # Predictor math is synchronous; keep it off the event loop
+            # Shared with the optimizer, so the forecast is computed once per refresh from fresh PV
+            data.update(await self.hass.async_add_executor_job(self._compute_energy_forecast, data))
             
             if not self._enabled or self._emergency_mode:
                 decision = {"action": "hold", "reason": "Disabled or emergency mode"}
@@ -201,6 +279,9 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
                 decision = await self.optimizer.calculate_optimal_action(data)
                 # Always execute decision, including 'hold', to ensure inverter state is reverted to idle
                 await self.executor.execute_decision(decision)
+            
+            self.last_update_time = get_current_ha_time()
+            self.last_update_iso = self.last_update_time.isoformat()
                 
             return {
                 **data,
@@ -222,8 +303,18 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
             data["load_power"] = safe_float(self.hass.states.get(self.config[CONF_LOAD_POWER_SENSOR]))
             data["grid_power"] = safe_float(self.hass.states.get(self.config[CONF_GRID_POWER_SENSOR]))
             
-            data["pv_forecast_today"] = self._get_forecast_data(self.config[CONF_PV_FORECAST_TODAY_SENSOR])
-            data["pv_forecast_tomorrow"] = self._get_forecast_data(self.config[CONF_PV_FORECAST_TOMORROW_SENSOR])
+            # One state lookup (and one "not found" warning) per PV forecast entity
+            pv_today_id = self.config[CONF_PV_FORECAST_TODAY_SENSOR]
+            pv_tomorrow_id = self.config[CONF_PV_FORECAST_TOMORROW_SENSOR]
+            pv_today_state = self._get_forecast_state(pv_today_id)
+            pv_tomorrow_state = self._get_forecast_state(pv_tomorrow_id)
+            data["pv_today_wh"] = self._get_forecast_total_wh(pv_today_id, pv_today_state)
+            data["pv_tomorrow_wh"] = self._get_forecast_total_wh(pv_tomorrow_id, pv_tomorrow_state)
+            data["pv_forecast_today"] = self._get_forecast_data(pv_today_id, pv_today_state)
+            data["pv_forecast_tomorrow"] = self._get_forecast_data(pv_tomorrow_id, pv_tomorrow_state)
+            # Peak/total summaries for the PV forecast sensors, computed once per refresh
+            data["pv_forecast_today_summary"] = summarize_pv_forecast(data["pv_forecast_today"])
+            data["pv_forecast_tomorrow_summary"] = summarize_pv_forecast(data["pv_forecast_tomorrow"])
             
             work_mode_state = self.hass.states.get(self.config[CONF_WORK_MODE_SELECT])
             data["work_mode"] = work_mode_state.state if work_mode_state else None
@@ -240,7 +331,11 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
             data["today_battery_cycles"] = safe_float(today_state)
             data["total_battery_cycles"] = safe_float(total_state)
             
-            _LOGGER.debug(f"Battery cycles - Today: {today_state.state if today_state else 'None'} ({today_cycles_entity}), Total: {total_state.state if total_state else 'None'} ({total_cycles_entity})")
+            _LOGGER.debug(
+                "Battery cycles - Today: %s (%s), Total: %s (%s)",
+                today_state.state if today_state else 'None', today_cycles_entity,
+                total_state.state if total_state else 'None', total_cycles_entity
+            )
             
             # Read current values from number entities (UI configurable parameters)
             battery_capacity_entity = f"number.{DOMAIN}_battery_capacity"
@@ -272,13 +367,84 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
             return data
             
         except Exception as e:
-            _LOGGER.error(f"Error collecting sensor data: {e}")
+            _LOGGER.error("Error collecting sensor data: %s", e)
             return {}
 
-    def _get_forecast_data(self, entity_id: str) -> list:
+    def _compute_price_windows(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze the 24h price windows and current price situation once per refresh."""
+        if not data:
+            return {}
+        
+        price_data = data.get("price_data", {})
+        if "buy_prices" in price_data:
+            _LOGGER.debug("Price windows: buy_prices count=%d", len(price_data['buy_prices']))
+        if "sell_prices" in price_data:
+            _LOGGER.debug("Price windows: sell_prices count=%d", len(price_data['sell_prices']))
+        
+        try:
+            price_windows = self.time_analyzer.analyze_price_windows(price_data, PRICE_ANALYSIS_24H_WINDOW)
+            price_situation = self.time_analyzer.get_current_price_situation(price_windows)
+        except (KeyError, AttributeError, TypeError) as e:
+            _LOGGER.debug("Price window analysis unavailable: %s", e)
+            return {}
+        
+        return {
+            "price_windows": price_windows,
+            "price_situation": price_situation,
+        }
+
+    def _compute_energy_forecast(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute energy balances, battery strategy and situation once per refresh for the sensors.
+        
+        Runs in the executor; only reads state, never writes it.
+        """
+        if not data:
+            return {}
+        
+        try:
+            # Use this refresh's PV values; the PV forecast sensors still hold the previous
+            # refresh (and do not exist yet on the first refresh)
+            balances = self.energy_predictor.calculate_combined_balance(
+                data.get("pv_today_wh", 0.0),
+                data.get("pv_tomorrow_wh", 0.0),
+                data.get("pv_forecast_today_summary")
+            )
+            strategy = self.energy_predictor.assess_battery_strategy(
+                data.get("battery_level", 0.0),
+                data.get("battery_capacity", FALLBACK_BATTERY_CAPACITY_WH),
+                balances
+            )
+            situation = self.energy_predictor.get_energy_situation_summary(balances)
+        except Exception as e:
+            # A bad forecast must not fail the refresh (and with it the decision/executor step)
+            _LOGGER.warning("Energy forecast unavailable: %s", e)
+            return {}
+        
+        return {
+            "energy_situation": situation,
+            "balances": balances,
+            "battery_strategy": strategy,
+        }
+
+    def _get_forecast_state(self, entity_id: str):
         state = self.hass.states.get(entity_id)
         if not state:
-            _LOGGER.warning(f"PV forecast entity {entity_id} not found")
+            _LOGGER.warning("PV forecast entity %s not found", entity_id)
+        return state
+
+    def _get_forecast_total_wh(self, entity_id: str, state) -> float:
+        """Solcast forecast sensors contain daily totals in kWh, convert to Wh."""
+        if not state:
+            return 0.0
+        
+        try:
+            return round(float(state.state) * 1000.0, 2)
+        except (ValueError, TypeError) as e:
+            _LOGGER.error("Cannot convert PV forecast state '%s' of %s to float: %s", state.state, entity_id, e)
+            return 0.0
+
+    def _get_forecast_data(self, entity_id: str, state) -> list:
+        if not state:
             return []
         
         try:
@@ -298,19 +464,19 @@ class EnergyArbitrageCoordinator(DataUpdateCoordinator):
                     # Create a simple forecast entry
                     forecast_data = [{'pv_estimate': numeric_value, 'period_end': 'unknown'}]
                 except (ValueError, TypeError):
-                    _LOGGER.warning(f"No recognized forecast attribute found in {entity_id}. Available: {list(state.attributes.keys())}")
+                    _LOGGER.warning("No recognized forecast attribute found in %s. Available: %s", entity_id, list(state.attributes))
                     return []
             
             if forecast_data and len(forecast_data) > 0:                
                 return forecast_data
             else:
-                _LOGGER.warning(f"Forecast data is empty for {entity_id}")
+                _LOGGER.warning("Forecast data is empty for %s", entity_id)
                 return []
                 
         except Exception as e:
-            _LOGGER.error(f"Error getting forecast from {entity_id}: {e}")
+            _LOGGER.error("Error getting forecast from %s: %s", entity_id, e)
             import traceback
-            _LOGGER.error(f"Traceback: {traceback.format_exc()}")
+            _LOGGER.error("Traceback: %s", traceback.format_exc())
             return []
 
     def _get_price_data_age(self) -> Optional[int]:
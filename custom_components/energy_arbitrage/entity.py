@@ -0,0 +1,28 @@
+"""Shared entity helpers for Energy Arbitrage platforms."""
+from __future__ import annotations
+
+# Marks an empty attribute cache (coordinator.data itself may be None)
+_UNSET = object()
+
+
+class EnergyArbitrageCachedAttributesMixin:
+    """Caches extra_state_attributes per coordinator data object.
+
+    Subclasses implement _build_attributes(); it runs again whenever
+    coordinator.data is replaced, however the new data was set.
+    """
+
+    _attrs_cache_data: object = _UNSET
+    _attrs_cache: dict | None = None
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        data = self.coordinator.data
+        if data is not self._attrs_cache_data:
+            self._attrs_cache = self._build_attributes()
+            self._attrs_cache_data = data
+        return self._attrs_cache
+
+    def _build_attributes(self) -> dict | None:
+        """Attributes of this entity, or None if it has none."""
+        return None
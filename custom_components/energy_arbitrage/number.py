@@ -53,26 +53,26 @@ async def async_setup_entry(
         EnergyArbitrageExecutorCooldownNumber(coordinator, entry),
     ]
 
-    async_add_entities(entities)
+    async_add_entities(entities, update_before_add=False)
 
 
 class EnergyArbitrageBaseNumber(CoordinatorEntity, NumberEntity):
+    # Subclasses set the fallback value and whether the option is whole-numbered
+    _default: float
+    _as_int: bool = False
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry, config_key: str) -> None:
         super().__init__(coordinator)
         self._entry = entry
         self._config_key = config_key
         self._attr_unique_id = f"{entry.entry_id}_{config_key}"
         self._attr_has_entity_name = True
+        self._attr_device_info = coordinator.device_info
 
     @property
-    def device_info(self) -> dict:
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": "Energy Arbitrage",
-            "manufacturer": "Custom",
-            "model": "Energy Arbitrage System",
-            "sw_version": "1.0.0",
-        }
+    def native_value(self) -> float | int:
+        value = self._entry.options.get(self._config_key, self._entry.data.get(self._config_key, self._default))
+        return int(value) if self._as_int else value
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the configuration value."""
@@ -89,6 +89,8 @@ class EnergyArbitrageBaseNumber(CoordinatorEntity, NumberEntity):
 
 
 class EnergyArbitrageMinArbitrageMarginNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_MIN_ARBITRAGE_MARGIN
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_MIN_ARBITRAGE_MARGIN)
         self._attr_name = "Min Arbitrage Margin"
@@ -99,14 +101,11 @@ class EnergyArbitrageMinArbitrageMarginNumber(EnergyArbitrageBaseNumber):
         self._attr_native_unit_of_measurement = "%"
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def native_value(self) -> float:
-        config = self._entry.data
-        options = self._entry.options
-        return options.get(self._config_key, config.get(self._config_key, DEFAULT_MIN_ARBITRAGE_MARGIN))
-
 
 class EnergyArbitragePlanningHorizonNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_PLANNING_HORIZON
+    _as_int = True
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_PLANNING_HORIZON)
         self._attr_name = "Planning Horizon"
@@ -117,14 +116,10 @@ class EnergyArbitragePlanningHorizonNumber(EnergyArbitrageBaseNumber):
         self._attr_native_unit_of_measurement = "h"
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def native_value(self) -> int:
-        config = self._entry.data
-        options = self._entry.options
-        return int(options.get(self._config_key, config.get(self._config_key, DEFAULT_PLANNING_HORIZON)))
-
 
 class EnergyArbitrageMaxDailyCyclesNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_MAX_DAILY_CYCLES
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_MAX_DAILY_CYCLES)
         self._attr_name = "Max Daily Cycles"
@@ -135,14 +130,10 @@ class EnergyArbitrageMaxDailyCyclesNumber(EnergyArbitrageBaseNumber):
         self._attr_native_unit_of_measurement = "c"
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def native_value(self) -> float:
-        config = self._entry.data
-        options = self._entry.options
-        return options.get(self._config_key, config.get(self._config_key, DEFAULT_MAX_DAILY_CYCLES))
-
 
 class EnergyArbitrageBatteryEfficiencyNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_BATTERY_EFFICIENCY
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_BATTERY_EFFICIENCY)
         self._attr_name = "Battery Efficiency"
@@ -153,14 +144,11 @@ class EnergyArbitrageBatteryEfficiencyNumber(EnergyArbitrageBaseNumber):
         self._attr_native_unit_of_measurement = "%"
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def native_value(self) -> float:
-        config = self._entry.data
-        options = self._entry.options
-        return options.get(self._config_key, config.get(self._config_key, DEFAULT_BATTERY_EFFICIENCY))
-
 
 class EnergyArbitrageMinBatteryReserveNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_MIN_BATTERY_RESERVE
+    _as_int = True
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_MIN_BATTERY_RESERVE)
         self._attr_name = "Min Battery Reserve"
@@ -171,14 +159,11 @@ class EnergyArbitrageMinBatteryReserveNumber(EnergyArbitrageBaseNumber):
         self._attr_native_unit_of_measurement = "%"
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def native_value(self) -> int:
-        config = self._entry.data
-        options = self._entry.options
-        return int(options.get(self._config_key, config.get(self._config_key, DEFAULT_MIN_BATTERY_RESERVE)))
-
 
 class EnergyArbitrageMaxBatteryPowerNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_MAX_BATTERY_POWER
+    _as_int = True
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_MAX_BATTERY_POWER)
         self._attr_name = "Max Battery Power"
@@ -190,14 +175,11 @@ class EnergyArbitrageMaxBatteryPowerNumber(EnergyArbitrageBaseNumber):
         self._attr_native_unit_of_measurement = "W"
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def native_value(self) -> int:
-        config = self._entry.data
-        options = self._entry.options
-        return int(options.get(self._config_key, config.get(self._config_key, DEFAULT_MAX_BATTERY_POWER)))
-
 
 class EnergyArbitrageBatteryCapacityNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_BATTERY_CAPACITY
+    _as_int = True
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_BATTERY_CAPACITY)
         self._attr_name = "Battery Capacity"
@@ -209,14 +191,11 @@ class EnergyArbitrageBatteryCapacityNumber(EnergyArbitrageBaseNumber):
         self._attr_native_unit_of_measurement = "Wh"
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def native_value(self) -> int:
-        config = self._entry.data
-        options = self._entry.options
-        return int(options.get(self._config_key, config.get(self._config_key, DEFAULT_BATTERY_CAPACITY)))
-
 
 class EnergyArbitrageMinArbitrageDepthNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_MIN_ARBITRAGE_DEPTH
+    _as_int = True
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_MIN_ARBITRAGE_DEPTH)
         self._attr_name = "Min Arbitrage Depth"
@@ -227,14 +206,11 @@ class EnergyArbitrageMinArbitrageDepthNumber(EnergyArbitrageBaseNumber):
         self._attr_native_unit_of_measurement = "%"
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def native_value(self) -> int:
-        config = self._entry.data
-        options = self._entry.options
-        return int(options.get(self._config_key, config.get(self._config_key, DEFAULT_MIN_ARBITRAGE_DEPTH)))
-
 
 class EnergyArbitrageExecutorCooldownNumber(EnergyArbitrageBaseNumber):
+    _default = DEFAULT_EXECUTOR_COOLDOWN_SECONDS
+    _as_int = True
+
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, CONF_EXECUTOR_COOLDOWN_SECONDS)
         self._attr_name = "Executor Cooldown"
@@ -244,9 +220,3 @@ class EnergyArbitrageExecutorCooldownNumber(EnergyArbitrageBaseNumber):
         self._attr_native_step = 1
         self._attr_native_unit_of_measurement = "s"
         self._attr_mode = NumberMode.BOX
-
-    @property
-    def native_value(self) -> int:
-        config = self._entry.data
-        options = self._entry.options
-        return int(options.get(self._config_key, config.get(self._config_key, DEFAULT_EXECUTOR_COOLDOWN_SECONDS)))
\ No newline at end of file
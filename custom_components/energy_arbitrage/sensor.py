@@ -1,26 +1,65 @@
 from __future__ import annotations
 import logging
 from datetime import datetime
-from typing import Any
-from .arbitrage.utils import get_current_ha_time, format_ha_time, safe_float
-from .arbitrage.constants import FALLBACK_BATTERY_CAPACITY_WH
-from .arbitrage.predictor import EnergyBalancePredictor
-from .arbitrage.sensor_data_helper import SensorDataHelper
-from .arbitrage.time_analyzer import TimeWindowAnalyzer
+from typing import Any, Literal
+from .arbitrage.utils import format_ha_time, get_current_ha_time
 from .arbitrage.constants import MIN_SPREAD_PERCENT, MIN_TRADE_ENERGY_WH, TRADE_COOLDOWN_MINUTES
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.const import UnitOfPower, UnitOfEnergy, PERCENTAGE
 
 from .const import DOMAIN, CONF_CURRENCY, DEFAULT_CURRENCY
 from .coordinator import EnergyArbitrageCoordinator
+from .entity import EnergyArbitrageCachedAttributesMixin
 
 _LOGGER = logging.getLogger(__name__)
 
+# strftime formats used when rendering price window attributes (_FMT_TS[11:16] is HH:MM)
+_FMT_TS = "%Y-%m-%d %H:%M:%S %Z"
+_FMT_HM = "%H:%M"
+
+# Attribute key prefixes of the (at most three) rendered windows per action
+_BUY_PREFIXES = ("buy_window_1_", "buy_window_2_", "buy_window_3_")
+_SELL_PREFIXES = ("sell_window_1_", "sell_window_2_", "sell_window_3_")
+
+# Icons of the current price sensors per price side
+_PRICE_ICONS = {"buy": "mdi:currency-eur-off", "sell": "mdi:currency-eur"}
+
+
+def _fmt_window(base: str, window, now: datetime) -> dict:
+    """Build all attributes of one rendered window in a single dict literal."""
+    st = window.start_time
+    # Full timestamp with timezone for debugging; HH:MM start is sliced from it instead of re-formatted
+    ts = st.strftime(_FMT_TS)
+    # Same tests as PriceWindow.is_current/is_upcoming, against the render's single "now"
+    if st <= now < window.end_time:
+        status = "active"
+    elif now < st:
+        status = "upcoming"
+    else:
+        status = "past"
+    return {
+        base + "timestamp": ts,
+        base + "start": ts[11:16],
+        base + "end": window.end_time.strftime(_FMT_HM),
+        base + "duration": round(window.duration_hours, 1),
+        base + "price": round(window.price, 4),
+        base + "urgency": window.urgency,
+        base + "status": status,
+    }
+
+
+def _render_windows(attributes: dict, windows: list, prefixes: tuple, top3_prices: list, top3_starts: list, now: datetime) -> None:
+    """Write the per-window attributes for one action and fill its top-3 arrays."""
+    for base, window in zip(prefixes, windows):
+        top3_prices.append(round(window.price, 4))
+        top3_starts.append(window.start_time.isoformat())
+        attributes.update(_fmt_window(base, window, now))
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -35,8 +74,8 @@ async def async_setup_entry(
         
         
         # 💰 Current pricing
-        EnergyArbitrageCurrentBuyPriceSensor(coordinator, entry),
-        EnergyArbitrageCurrentSellPriceSensor(coordinator, entry),
+        EnergyArbitrageCurrentPriceSensor(coordinator, entry, "buy"),
+        EnergyArbitrageCurrentPriceSensor(coordinator, entry, "sell"),
         
         # ⚡ System monitoring  
         EnergyArbitrageBatteryLevelSensor(coordinator, entry),
@@ -45,8 +84,8 @@ async def async_setup_entry(
         EnergyArbitrageGridPowerSensor(coordinator, entry),
         
         # ☀️ Solar forecasting
-        EnergyArbitragePVForecastTodaySensor(coordinator, entry),
-        EnergyArbitragePVForecastTomorrowSensor(coordinator, entry),
+        EnergyArbitragePVForecastSensor(coordinator, entry, "today"),
+        EnergyArbitragePVForecastSensor(coordinator, entry, "tomorrow"),
         
         # 🧠 Predictive intelligence
         EnergyArbitrageEnergyForecastSensor(coordinator, entry),
@@ -55,33 +94,39 @@ async def async_setup_entry(
         EnergyArbitragePolicyDecisionSensor(coordinator, entry),
     ]
 
-    async_add_entities(entities)
+    # Initial state comes from the first coordinator refresh, done before platforms are set up
+    async_add_entities(entities, update_before_add=False)
+
+    async def _async_options_updated(hass: HomeAssistant, updated_entry: ConfigEntry) -> None:
+        # Currency is cached per entity; re-resolve it when options change
+        for entity in entities:
+            entity._refresh_currency()
+
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
-class EnergyArbitrageBaseSensor(CoordinatorEntity, SensorEntity):
+class EnergyArbitrageBaseSensor(EnergyArbitrageCachedAttributesMixin, CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry, sensor_type: str) -> None:
         super().__init__(coordinator)
         self._entry = entry
         self._sensor_type = sensor_type
         self._attr_unique_id = f"{entry.entry_id}_{sensor_type}"
         self._attr_has_entity_name = True
+        self._attr_device_info = coordinator.device_info
+        self._currency = entry.options.get(CONF_CURRENCY, entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY))
     
     @property
-    def currency(self) -> str:
-        """Get the configured currency from the entry data."""
-        config = self._entry.data
-        options = self._entry.options
-        # Use already imported constants
-        return options.get(CONF_CURRENCY, config.get(CONF_CURRENCY, DEFAULT_CURRENCY))
+    def available(self) -> bool:
+        """Unavailable until the coordinator has produced data, so HA skips state reads."""
+        return super().available and self.coordinator.data is not None
 
     @property
-    def device_info(self) -> dict:
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": "Energy Arbitrage",
-            "manufacturer": "Custom",
-            "model": "Energy Arbitrage System",
-            "sw_version": "1.0.0",
-        }
+    def currency(self) -> str:
+        """Get the configured currency (resolved once, refreshed on options update)."""
+        return self._currency
+
+    def _refresh_currency(self) -> None:
+        """Re-resolve the currency from the entry options/data."""
+        self._currency = self._entry.options.get(CONF_CURRENCY, self._entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY))
 
 class EnergyArbitrageROISensor(EnergyArbitrageBaseSensor):
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
@@ -89,18 +134,20 @@ class EnergyArbitrageROISensor(EnergyArbitrageBaseSensor):
         self._attr_name = "Expected ROI"
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_suggested_display_precision = 2
         self._attr_icon = "mdi:trending-up"
 
     @property
     def native_value(self) -> float:
-        if not self.coordinator.data:
+        data = self.coordinator.data
+        if not data:
             return 0.0
         
-        decision = self.coordinator.data.get("decision", {})
+        decision = data.get("decision", {})
         opportunity = decision.get("opportunity")
         
         if opportunity:
-            return round(opportunity.get("roi_percent", 0.0), 2)
+            return opportunity.get("roi_percent", 0.0)
         
         return 0.0
 
@@ -112,32 +159,33 @@ class EnergyArbitrageStatusSensor(EnergyArbitrageBaseSensor):
 
     @property
     def native_value(self) -> str:
-        if not self.coordinator.data:
+        data = self.coordinator.data
+        if not data:
             return "unknown"
         
-        if self.coordinator.data.get("emergency_mode"):
+        if data.get("emergency_mode"):
             return "emergency"
-        elif not self.coordinator.data.get("enabled"):
+        elif not data.get("enabled"):
             return "disabled"
-        elif self.coordinator.data.get("manual_override_until"):
+        elif data.get("manual_override_until"):
             return "manual_override"
         else:
             return "active"
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
+    def _build_attributes(self) -> dict:
+        data = self.coordinator.data
+        if not data:
             return {}
         
         attrs = {
-            "enabled": self.coordinator.data.get("enabled", False),
-            "emergency_mode": self.coordinator.data.get("emergency_mode", False),
-            "price_data_age": self.coordinator.data.get("price_data_age"),
-            # FIXED: Use HA timezone for sensor last update
-            "last_update": get_current_ha_time().isoformat(),
+            "enabled": data.get("enabled", False),
+            "emergency_mode": data.get("emergency_mode", False),
+            "price_data_age": data.get("price_data_age"),
+            # Time of the last completed coordinator refresh (HA timezone)
+            "last_update": self.coordinator.last_update_iso,
         }
         
-        manual_override = self.coordinator.data.get("manual_override_until")
+        manual_override = data.get("manual_override_until")
         if manual_override:
             attrs["manual_override_until"] = manual_override.isoformat()
         
@@ -146,115 +194,97 @@ class EnergyArbitrageStatusSensor(EnergyArbitrageBaseSensor):
 
 # DELETED: TodayProfitSensor was just a duplicate of profit_forecast
 
-class EnergyArbitrageCurrentBuyPriceSensor(EnergyArbitrageBaseSensor):
-    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator, entry, "current_buy_price")
-        self._attr_name = "Current Buy Price"
+class EnergyArbitrageCurrentPriceSensor(EnergyArbitrageBaseSensor):
+    """Current buy or sell price from the MQTT price forecast."""
+
+    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry, side: Literal["buy", "sell"]) -> None:
+        super().__init__(coordinator, entry, f"current_{side}_price")
+        self._side = side
+        self._prices_key = f"{side}_prices"
+        self._attr_name = f"Current {side.capitalize()} Price"
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        currency = self.currency
-        self._attr_native_unit_of_measurement = currency
-        self._attr_icon = "mdi:currency-eur-off"
+        self._attr_native_unit_of_measurement = self.currency
+        self._attr_suggested_display_precision = 4
+        self._attr_icon = _PRICE_ICONS[side]
 
     @property
     def native_value(self) -> float:
-        if not self.coordinator.data:
+        data = self.coordinator.data
+        if not data:
             return 0.0
         
-        # Get current buy price using proper time matching
-        current_price = self.coordinator.get_current_buy_price()
-        return round(current_price, 4)
-
-    @property
-    def native_unit_of_measurement(self) -> str:
-        return self.currency
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
+        # Get current price using proper time matching
+        if self._side == "buy":
+            return self.coordinator.get_current_buy_price()
+        return self.coordinator.get_current_sell_price()
+
+    def _refresh_currency(self) -> None:
+        super()._refresh_currency()
+        if self._attr_native_unit_of_measurement != self._currency:
+            self._attr_native_unit_of_measurement = self._currency
+            if self.hass is not None:
+                self.async_write_ha_state()
+
+    def _build_attributes(self) -> dict:
+        data = self.coordinator.data
+        if not data:
             return {}
         
-        price_data = self.coordinator.data.get("price_data", {})
-        buy_prices = price_data.get("buy_prices", [])
+        price_data = data.get("price_data", {})
+        prices = price_data.get(self._prices_key, [])
         
         # Get current entry using proper time matching
-        current_entry = self.coordinator._find_current_price_entry(buy_prices)
+        current_entry = self.coordinator._find_current_price_entry(self._side)
         
         attrs = {
             "data_source": "mqtt_energy_forecast",
             "update_time": price_data.get("last_updated", "unknown"),
-            "prices_count": len(buy_prices),
+            "prices_count": len(prices),
             "current_timestamp": current_entry.get("start", "unknown"),
             "current_period_end": current_entry.get("end", "unknown"),
         }
         
         # Try to find next price entry
-        if current_entry and buy_prices:
-            current_start = current_entry.get("start")
-            for i, entry in enumerate(buy_prices):
-                if entry.get("start") == current_start and i + 1 < len(buy_prices):
-                    attrs["next_price"] = buy_prices[i + 1].get("value", 0.0)
-                    attrs["next_timestamp"] = buy_prices[i + 1].get("start", "unknown")
-                    break
+        if current_entry and prices:
+            next_entry = self.coordinator.get_next_price_entry(self._side, current_entry.get("start"))
+            if next_entry:
+                attrs["next_price"] = next_entry.get("value", 0.0)
+                attrs["next_timestamp"] = next_entry.get("start", "unknown")
         
         return attrs
 
 
-# DELETED: MonthlyProfitSensor - was a stub returning 0.0
+class EnergyArbitrageInputSensor(EnergyArbitrageBaseSensor):
+    """Mirrors one numeric value of the coordinator data, writing state only when it changes."""
 
-class EnergyArbitrageCurrentSellPriceSensor(EnergyArbitrageBaseSensor):
-    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator, entry, "current_sell_price")
-        self._attr_name = "Current Sell Price"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        currency = self.currency
-        self._attr_native_unit_of_measurement = currency
-        self._attr_icon = "mdi:currency-eur"
+    _data_key: str
 
-    @property
-    def native_value(self) -> float:
-        if not self.coordinator.data:
+    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry, sensor_type: str) -> None:
+        super().__init__(coordinator, entry, sensor_type)
+        self._attr_native_value = self._read_value()
+        self._was_available = self.available
+
+    def _read_value(self) -> float:
+        data = self.coordinator.data
+        if not data:
             return 0.0
-        
-        # Get current sell price using proper time matching
-        current_price = self.coordinator.get_current_sell_price()
-        return round(current_price, 4)
+        return data.get(self._data_key, 0.0)
 
-    @property
-    def native_unit_of_measurement(self) -> str:
-        return self.currency
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        value = self._read_value()
+        available = self.available
+        # The same reading is republished on most refreshes; skip those writes
+        if value == self._attr_native_value and available == self._was_available:
+            return
+        self._attr_native_value = value
+        self._was_available = available
+        self.async_write_ha_state()
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
-            return {}
-        
-        price_data = self.coordinator.data.get("price_data", {})
-        sell_prices = price_data.get("sell_prices", [])
-        
-        # Get current entry using proper time matching
-        current_entry = self.coordinator._find_current_price_entry(sell_prices)
-        
-        attrs = {
-            "data_source": "mqtt_energy_forecast",
-            "update_time": price_data.get("last_updated", "unknown"),
-            "prices_count": len(sell_prices),
-            "current_timestamp": current_entry.get("start", "unknown"),
-            "current_period_end": current_entry.get("end", "unknown"),
-        }
-        
-        # Try to find next price entry
-        if current_entry and sell_prices:
-            current_start = current_entry.get("start")
-            for i, entry in enumerate(sell_prices):
-                if entry.get("start") == current_start and i + 1 < len(sell_prices):
-                    attrs["next_price"] = sell_prices[i + 1].get("value", 0.0)
-                    attrs["next_timestamp"] = sell_prices[i + 1].get("start", "unknown")
-                    break
-        
-        return attrs
 
+class EnergyArbitrageBatteryLevelSensor(EnergyArbitrageInputSensor):
+    _data_key = "battery_level"
 
-class EnergyArbitrageBatteryLevelSensor(EnergyArbitrageBaseSensor):
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "input_battery_level")
         self._attr_name = "Input Battery Level"
@@ -263,15 +293,10 @@ class EnergyArbitrageBatteryLevelSensor(EnergyArbitrageBaseSensor):
         self._attr_native_unit_of_measurement = PERCENTAGE
         self._attr_icon = "mdi:battery"
 
-    @property
-    def native_value(self) -> float:
-        if not self.coordinator.data:
-            return 0.0
-        
-        return self.coordinator.data.get("battery_level", 0.0)
 
+class EnergyArbitragePVPowerSensor(EnergyArbitrageInputSensor):
+    _data_key = "pv_power"
 
-class EnergyArbitragePVPowerSensor(EnergyArbitrageBaseSensor):
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "input_pv_power")
         self._attr_name = "Input PV Power"
@@ -280,15 +305,10 @@ class EnergyArbitragePVPowerSensor(EnergyArbitrageBaseSensor):
         self._attr_native_unit_of_measurement = UnitOfPower.WATT
         self._attr_icon = "mdi:solar-panel-large"
 
-    @property
-    def native_value(self) -> float:
-        if not self.coordinator.data:
-            return 0.0
-        
-        return self.coordinator.data.get("pv_power", 0.0)
 
+class EnergyArbitrageLoadPowerSensor(EnergyArbitrageInputSensor):
+    _data_key = "load_power"
 
-class EnergyArbitrageLoadPowerSensor(EnergyArbitrageBaseSensor):
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "input_load_power")
         self._attr_name = "Input Load Power"
@@ -297,15 +317,10 @@ class EnergyArbitrageLoadPowerSensor(EnergyArbitrageBaseSensor):
         self._attr_native_unit_of_measurement = UnitOfPower.WATT
         self._attr_icon = "mdi:home-lightning-bolt"
 
-    @property
-    def native_value(self) -> float:
-        if not self.coordinator.data:
-            return 0.0
-        
-        return self.coordinator.data.get("load_power", 0.0)
 
+class EnergyArbitrageGridPowerSensor(EnergyArbitrageInputSensor):
+    _data_key = "grid_power"
 
-class EnergyArbitrageGridPowerSensor(EnergyArbitrageBaseSensor):
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "input_grid_power")
         self._attr_name = "Input Grid Power"
@@ -314,160 +329,38 @@ class EnergyArbitrageGridPowerSensor(EnergyArbitrageBaseSensor):
         self._attr_native_unit_of_measurement = UnitOfPower.WATT
         self._attr_icon = "mdi:transmission-tower"
 
-    @property
-    def native_value(self) -> float:
-        if not self.coordinator.data:
-            return 0.0
-        
-        return self.coordinator.data.get("grid_power", 0.0)
-
-
-class EnergyArbitragePVForecastTodaySensor(EnergyArbitrageBaseSensor):
-    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator, entry, "input_pv_forecast_today")
-        self._attr_name = "Input PV Forecast Today"
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL
-        self._attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
-        self._attr_icon = "mdi:weather-sunny"
-
-    @property
-    def native_value(self) -> float:
-        if not self.coordinator.data:
-            _LOGGER.info("PVForecastTodaySensor: No coordinator data")
-            return 0.0
-        
-        # Get the source entity directly - Solcast sensors already contain daily totals
-        pv_today_entity = self.coordinator.config.get('pv_forecast_today_sensor')
-        if not pv_today_entity:
-            _LOGGER.warning("PVForecastTodaySensor: No PV forecast today entity configured")
-            return 0.0
-            
-        state = self.coordinator.hass.states.get(pv_today_entity)
-        if not state:
-            _LOGGER.warning(f"PVForecastTodaySensor: Entity {pv_today_entity} not found")
-            return 0.0
-        
-        try:
-            # Solcast forecast sensors contain daily totals in kWh, convert to Wh
-            value = float(state.state) * 1000.0  # Convert kWh to Wh
-            return round(value, 2)
-        except (ValueError, TypeError) as e:
-            _LOGGER.error(f"PVForecastTodaySensor: Cannot convert state '{state.state}' to float: {e}")
-            return 0.0
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
-            return {}
-        
-        forecast = self.coordinator.data.get("pv_forecast_today", [])
-        if not forecast:
-            return {"forecast_points": 0, "status": "No forecast data"}
-        
-        # Extract power values using the same logic as native_value
-        power_values = []
-        for entry in forecast:
-            if isinstance(entry, dict):
-                value = (entry.get('pv_estimate', 0) or 
-                        entry.get('pv_estimate_10', 0) or 
-                        entry.get('pv_estimate_90', 0) or
-                        entry.get('forecast', 0) or
-                        entry.get('value', 0) or
-                        entry.get('power', 0))
-                power_values.append(float(value) if value else 0.0)
-            elif isinstance(entry, (int, float)):
-                power_values.append(float(entry))
-        
-        max_power = max(power_values) if power_values else 0
-        max_index = power_values.index(max_power) if power_values and max_power > 0 else 0
-        
-        # Try to get period_end from the max power entry
-        peak_hour = ""
-        if max_index < len(forecast) and isinstance(forecast[max_index], dict):
-            peak_hour = forecast[max_index].get('period_end', '') or forecast[max_index].get('datetime', '') or forecast[max_index].get('time', '')
-        
-        return {
-            "forecast_points": len(forecast),
-            "peak_hour": peak_hour,
-            "peak_power": round(max_power, 3),
-            "total_forecast": round(sum(power_values), 2),
-            "data_format": "dict" if forecast and isinstance(forecast[0], dict) else "numeric"
-        }
 
+class EnergyArbitragePVForecastSensor(EnergyArbitrageBaseSensor):
+    """Daily Solcast PV forecast for either today or tomorrow."""
 
-class EnergyArbitragePVForecastTomorrowSensor(EnergyArbitrageBaseSensor):
-    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator, entry, "input_pv_forecast_tomorrow")
-        self._attr_name = "Input PV Forecast Tomorrow"
+    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry, day: Literal["today", "tomorrow"]) -> None:
+        super().__init__(coordinator, entry, f"input_pv_forecast_{day}")
+        self._value_key = f"pv_{day}_wh"
+        self._summary_key = f"pv_forecast_{day}_summary"
+        self._attr_name = f"Input PV Forecast {day.capitalize()}"
         self._attr_device_class = SensorDeviceClass.ENERGY
         self._attr_state_class = SensorStateClass.TOTAL
         self._attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
-        self._attr_icon = "mdi:weather-sunny-off"
+        self._attr_icon = "mdi:weather-sunny" if day == "today" else "mdi:weather-sunny-off"
 
     @property
     def native_value(self) -> float:
-        if not self.coordinator.data:
-            _LOGGER.info("PVForecastTomorrowSensor: No coordinator data")
-            return 0.0
-        
-        # Get the source entity directly - Solcast sensors already contain daily totals
-        pv_tomorrow_entity = self.coordinator.config.get('pv_forecast_tomorrow_sensor')
-        if not pv_tomorrow_entity:
-            _LOGGER.warning("PVForecastTomorrowSensor: No PV forecast tomorrow entity configured")
-            return 0.0
-            
-        state = self.coordinator.hass.states.get(pv_tomorrow_entity)
-        if not state:
-            _LOGGER.warning(f"PVForecastTomorrowSensor: Entity {pv_tomorrow_entity} not found")
-            return 0.0
-        
-        try:
-            # Solcast forecast sensors contain daily totals in kWh, convert to Wh
-            value = float(state.state) * 1000.0  # Convert kWh to Wh
-            return round(value, 2)
-        except (ValueError, TypeError) as e:
-            _LOGGER.error(f"PVForecastTomorrowSensor: Cannot convert state '{state.state}' to float: {e}")
+        data = self.coordinator.data
+        if not data:
             return 0.0
+        # Solcast daily total, converted to Wh once per refresh by the coordinator
+        return data.get(self._value_key, 0.0)
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
+    def _build_attributes(self) -> dict:
+        data = self.coordinator.data
+        if not data:
             return {}
         
-        forecast = self.coordinator.data.get("pv_forecast_tomorrow", [])
-        if not forecast:
+        # Summarized once per refresh by the coordinator
+        summary = data.get(self._summary_key)
+        if not summary:
             return {"forecast_points": 0, "status": "No forecast data"}
-        
-        # Extract power values using the same logic as native_value
-        power_values = []
-        for entry in forecast:
-            if isinstance(entry, dict):
-                value = (entry.get('pv_estimate', 0) or 
-                        entry.get('pv_estimate_10', 0) or 
-                        entry.get('pv_estimate_90', 0) or
-                        entry.get('forecast', 0) or
-                        entry.get('value', 0) or
-                        entry.get('power', 0))
-                power_values.append(float(value) if value else 0.0)
-            elif isinstance(entry, (int, float)):
-                power_values.append(float(entry))
-        
-        max_power = max(power_values) if power_values else 0
-        max_index = power_values.index(max_power) if power_values and max_power > 0 else 0
-        
-        # Try to get period_end from the max power entry
-        peak_hour = ""
-        if max_index < len(forecast) and isinstance(forecast[max_index], dict):
-            peak_hour = forecast[max_index].get('period_end', '') or forecast[max_index].get('datetime', '') or forecast[max_index].get('time', '')
-        
-        return {
-            "forecast_points": len(forecast),
-            "peak_hour": peak_hour,
-            "peak_power": round(max_power, 3),
-            "total_forecast": round(sum(power_values), 2),
-            "data_format": "dict" if forecast and isinstance(forecast[0], dict) else "numeric"
-        }
+        return summary
 
 
 class EnergyArbitrageEnergyForecastSensor(EnergyArbitrageBaseSensor):
@@ -479,73 +372,53 @@ class EnergyArbitrageEnergyForecastSensor(EnergyArbitrageBaseSensor):
 
     @property
     def native_value(self) -> str:
-        if not self.coordinator.data:
+        data = self.coordinator.data
+        if not data:
             return "unknown"
         
-        try:
-            # Use already imported classes
-            
-            sensor_helper = SensorDataHelper(self.hass, self.coordinator.entry.entry_id, self.coordinator)
-            predictor = EnergyBalancePredictor(sensor_helper)
-            
-            energy_situation = predictor.get_energy_situation_summary()
-            return energy_situation
-            
-        except Exception as e:
-            return f"error"
+        # Computed once per refresh by the coordinator
+        return data.get("energy_situation", "unknown")
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
+    def _build_attributes(self) -> dict:
+        data = self.coordinator.data
+        if not data:
             return {}
         
-        try:
-            # Use already imported classes
-            
-            sensor_helper = SensorDataHelper(self.hass, self.coordinator.entry.entry_id, self.coordinator)
-            predictor = EnergyBalancePredictor(sensor_helper)
+        # Energy balances and battery strategy are computed once per refresh by the coordinator
+        balances = data.get("balances")
+        strategy = data.get("battery_strategy")
+        if not balances or not strategy:
+            return {"status": "unavailable"}
+        
+        today = balances['today']
+        tomorrow = balances['tomorrow']
+        return {
+            # Today's forecast
+            "today_pv_forecast_wh": round(today.pv_forecast_wh),
+            "today_consumption_forecast_wh": round(today.consumption_forecast_wh),
+            "today_net_balance_wh": round(today.net_balance_wh),
+            "today_has_surplus": today.has_surplus,
             
-            # Get energy balances
-            balances = predictor.calculate_combined_balance()
+            # Tomorrow's forecast
+            "tomorrow_pv_forecast_wh": round(tomorrow.pv_forecast_wh),
+            "tomorrow_consumption_forecast_wh": round(tomorrow.consumption_forecast_wh),
+            "tomorrow_net_balance_wh": round(tomorrow.net_balance_wh),
+            "tomorrow_has_surplus": tomorrow.has_surplus,
             
-            # Get battery strategy
-            # Use already imported safe_float
-            battery_level = safe_float(self.hass.states.get(self.coordinator.config.get('battery_level_sensor')))
-            battery_capacity = self.coordinator.data.get("battery_capacity", FALLBACK_BATTERY_CAPACITY_WH)
-            strategy = predictor.assess_battery_strategy(battery_level, battery_capacity)
+            # 48h outlook
+            "next_48h_net_balance_wh": round(balances['next_48h'].net_balance_wh),
             
-            return {
-                # Today's forecast
-                "today_pv_forecast": f"{balances['today'].pv_forecast_wh:.0f}Wh",
-                "today_consumption_forecast": f"{balances['today'].consumption_forecast_wh:.0f}Wh", 
-                "today_net_balance": f"{balances['today'].net_balance_wh:+.0f}Wh",
-                "today_has_surplus": balances['today'].has_surplus,
-                
-                # Tomorrow's forecast
-                "tomorrow_pv_forecast": f"{balances['tomorrow'].pv_forecast_wh:.0f}Wh",
-                "tomorrow_consumption_forecast": f"{balances['tomorrow'].consumption_forecast_wh:.0f}Wh",
-                "tomorrow_net_balance": f"{balances['tomorrow'].net_balance_wh:+.0f}Wh", 
-                "tomorrow_has_surplus": balances['tomorrow'].has_surplus,
-                
-                # 48h outlook
-                "next_48h_net_balance": f"{balances['next_48h'].net_balance_wh:+.0f}Wh",
-                
-                # Strategy
-                "strategy_recommendation": strategy['recommendation'],
-                "strategy_reason": strategy['reason'],
-                "target_battery_level": f"{strategy['target_battery_level']:.0f}%",
-                "strategy_urgency": strategy['urgency'],
-                "strategy_confidence": f"{strategy['confidence']*100:.0f}%",
-                
-                # Status
-                "forecast_status": "active" if balances['today'].confidence > 0.5 else "limited"
-            }
+            # Strategy
+            "strategy_recommendation": strategy['recommendation'],
+            "strategy_reason": strategy['reason'],
+            "target_battery_level_percent": round(strategy['target_battery_level']),
+            "strategy_urgency": strategy['urgency'],
+            "strategy_confidence_percent": round(strategy['confidence'] * 100),
             
-        except Exception as e:
-            return {
-                "error": str(e),
-                "status": "unavailable"
-            }
+            # Status
+            "forecast_status": "active" if today.confidence > 0.5 else "limited"
+        }
+
 
 
 class EnergyArbitragePolicyDecisionSensor(EnergyArbitrageBaseSensor):
@@ -553,84 +426,87 @@ class EnergyArbitragePolicyDecisionSensor(EnergyArbitrageBaseSensor):
         super().__init__(coordinator, entry, "policy_decision")
         self._attr_name = "Policy Decision"
         self._attr_icon = "mdi:shield-check"
+        # Optimizer analysis snapshot shared by the state and the attributes
+        self._last_analysis: dict = {}
+        self._attr_native_value = self._compute_action()
+
+    def _compute_action(self) -> str | None:
+        """Resolve the current policy action once per coordinator update."""
+        self._last_analysis = {}
+        data = self.coordinator.data
+        if not data:
+            return None
+        last = self.coordinator.optimizer.get_last_analysis()
+        self._last_analysis = last
+        immediate = last.get('price_situation', {}).get('immediate_action')
+        if immediate:
+            return immediate.get('action', 'hold')
+        # Fallback to decision action
+        return (data.get("decision") or {}).get("action", "hold")
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._attr_native_value = self._compute_action()
+        super()._handle_coordinator_update()
 
     @property
     def native_value(self) -> str:
-        if not self.coordinator.data:
-            return "unknown"
-        try:
-            if hasattr(self.coordinator, 'optimizer'):
-                last = self.coordinator.optimizer.get_last_analysis() or {}
-                price_situation = last.get('price_situation', {})
-                if price_situation.get('immediate_action'):
-                    return price_situation['immediate_action'].get('action', 'hold')
-            # Fallback to decision action
-            return (self.coordinator.data.get("decision") or {}).get("action", "hold")
-        except Exception:
-            return "error"
+        return self._attr_native_value or "unknown"
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
+    def _build_attributes(self) -> dict:
+        data = self.coordinator.data
+        if not data:
             return {}
-        try:
-            attrs: dict[str, Any] = {}
-            decision = self.coordinator.data.get("decision", {})
-            attrs["decision_action"] = decision.get("action")
-            attrs["decision_reason"] = decision.get("reason")
-            attrs["target_power"] = decision.get("target_power")
-            attrs["target_battery_level"] = decision.get("target_battery_level")
-
-            # Near-term rebuy context
-            last = getattr(self.coordinator, 'optimizer', None).get_last_analysis() if hasattr(self.coordinator, 'optimizer') else {}
-            near = (last or {}).get('near_term_rebuy', {})
-            attrs["near_term_has_opportunity"] = near.get('has_opportunity', False)
-            attrs["near_term_roi_percent"] = round(near.get('roi_percent', 0.0), 2)
-            attrs["near_term_lookahead_h"] = near.get('lookahead_hours')
-            attrs["near_term_min_upcoming_buy"] = near.get('min_upcoming_buy')
-            attrs["current_sell_price"] = near.get('current_sell_price')
-
-            # Price situation
-            price_situation = (last or {}).get('price_situation', {})
-            if price_situation.get('immediate_action'):
-                attrs["immediate_action"] = price_situation['immediate_action'].get('action')
-                attrs["immediate_price"] = price_situation['immediate_action'].get('price')
-                attrs["immediate_urgency"] = price_situation['immediate_action'].get('urgency')
-                attrs["immediate_time_remaining_h"] = price_situation['immediate_action'].get('time_remaining')
-            if price_situation.get('next_opportunity'):
-                attrs["next_action"] = price_situation['next_opportunity'].get('action')
-                attrs["next_price"] = price_situation['next_opportunity'].get('price')
-                attrs["next_urgency"] = price_situation['next_opportunity'].get('urgency')
-                attrs["next_time_until_h"] = price_situation['next_opportunity'].get('time_until_start')
-
-            # Last trades and policy constants
-            if hasattr(self.coordinator, 'optimizer'):
-                last_trades = self.coordinator.optimizer.get_last_trades()
-                attrs.update({
-                    "last_sell_ts": last_trades.get('sell'),
-                    "last_buy_ts": last_trades.get('buy')
-                })
-            attrs.update({
-                "min_trade_energy_wh": MIN_TRADE_ENERGY_WH,
-                "min_spread_percent": MIN_SPREAD_PERCENT,
-                "trade_cooldown_minutes": TRADE_COOLDOWN_MINUTES,
-            })
-
-            # Best opportunity snapshot
-            if hasattr(self.coordinator, 'optimizer'):
-                opps = self.coordinator.optimizer.get_last_opportunities()
-                if opps:
-                    best = opps[0]
-                    attrs.update({
-                        "best_roi_percent": round(best.get('roi_percent', 0.0), 2),
-                        "best_is_immediate_buy": best.get('is_immediate_buy', False),
-                        "best_is_immediate_sell": best.get('is_immediate_sell', False),
-                        "best_net_profit_per_kwh": best.get('net_profit_per_kwh', 0.0)
-                    })
-
-            return attrs
-        except Exception as e:
-            return {"error": str(e)}
+        optimizer = self.coordinator.optimizer
+        decision = data.get("decision", {})
+        # Near-term rebuy context (analysis fetched once per update in _compute_action)
+        last = self._last_analysis
+        near = last.get('near_term_rebuy', {})
+        last_trades = optimizer.get_last_trades()
+
+        # Unconditional attributes in one literal: decision, near-term rebuy, last trades, policy constants
+        attrs: dict[str, Any] = {
+            "decision_action": decision.get("action"),
+            "decision_reason": decision.get("reason"),
+            "target_power": decision.get("target_power"),
+            "target_battery_level": decision.get("target_battery_level"),
+            "near_term_has_opportunity": near.get('has_opportunity', False),
+            "near_term_roi_percent": round(near.get('roi_percent', 0.0), 2),
+            "near_term_lookahead_h": near.get('lookahead_hours'),
+            "near_term_min_upcoming_buy": near.get('min_upcoming_buy'),
+            "current_sell_price": near.get('current_sell_price'),
+            "last_sell_ts": last_trades.get('sell'),
+            "last_buy_ts": last_trades.get('buy'),
+            "min_trade_energy_wh": MIN_TRADE_ENERGY_WH,
+            "min_spread_percent": MIN_SPREAD_PERCENT,
+            "trade_cooldown_minutes": TRADE_COOLDOWN_MINUTES,
+        }
+
+        # Price situation
+        price_situation = last.get('price_situation', {})
+        immediate = price_situation.get('immediate_action')
+        if immediate:
+            attrs["immediate_action"] = immediate.get('action')
+            attrs["immediate_price"] = immediate.get('price')
+            attrs["immediate_urgency"] = immediate.get('urgency')
+            attrs["immediate_time_remaining_h"] = immediate.get('time_remaining')
+        next_opp = price_situation.get('next_opportunity')
+        if next_opp:
+            attrs["next_action"] = next_opp.get('action')
+            attrs["next_price"] = next_opp.get('price')
+            attrs["next_urgency"] = next_opp.get('urgency')
+            attrs["next_time_until_h"] = next_opp.get('time_until_start')
+
+        # Best opportunity snapshot
+        opps = optimizer.get_last_opportunities()
+        if opps:
+            best = opps[0]
+            attrs["best_roi_percent"] = round(best.get('roi_percent', 0.0), 2)
+            attrs["best_is_immediate_buy"] = best.get('is_immediate_buy', False)
+            attrs["best_is_immediate_sell"] = best.get('is_immediate_sell', False)
+            attrs["best_net_profit_per_kwh"] = best.get('net_profit_per_kwh', 0.0)
+
+        return attrs
 
 
 class EnergyArbitragePriceWindowsSensor(EnergyArbitrageBaseSensor):
@@ -642,144 +518,101 @@ class EnergyArbitragePriceWindowsSensor(EnergyArbitrageBaseSensor):
 
     @property
     def native_value(self) -> str:
-        if not self.coordinator.data:
+        data = self.coordinator.data
+        if not data:
             return "no_data"
         
-        try:
-            # Use already imported classes
-            
-            sensor_helper = SensorDataHelper(self.hass, self.coordinator.entry.entry_id, self.coordinator)
-            time_analyzer = TimeWindowAnalyzer(sensor_helper)
-            
-            # Analyze price windows
-            price_data = self.coordinator.data.get("price_data", {})
-            if "buy_prices" in price_data:
-                _LOGGER.debug(f"PriceWindowsSensor: buy_prices count={len(price_data['buy_prices'])}")
-            if "sell_prices" in price_data:
-                _LOGGER.debug(f"PriceWindowsSensor: sell_prices count={len(price_data['sell_prices'])}")
-            
-            price_windows = time_analyzer.analyze_price_windows(price_data, 24)
-            
-            if not price_windows:
-                return "no_windows"
-            
-            # Get current situation
-            price_situation = time_analyzer.get_current_price_situation(price_windows)
-            
-            if price_situation.get('current_opportunities', 0) > 0:
-                return "active_opportunity"
-            elif price_situation.get('upcoming_opportunities', 0) > 0:
-                return "upcoming_opportunity"
-            else:
-                return "monitoring"
-                
-        except Exception as e:
+        # Analyzed once per refresh by the coordinator
+        if "price_windows" not in data:
             return "error"
+        price_windows = data["price_windows"]
+        price_situation = data["price_situation"]
+        
+        if not price_windows:
+            return "no_windows"
+        
+        if price_situation.get('current_opportunities', 0) > 0:
+            return "active_opportunity"
+        elif price_situation.get('upcoming_opportunities', 0) > 0:
+            return "upcoming_opportunity"
+        else:
+            return "monitoring"
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
+    def _build_attributes(self) -> dict:
+        data = self.coordinator.data
+        if not data:
             return {}
         
-        try:
-            # Use already imported classes
-            
-            sensor_helper = SensorDataHelper(self.hass, self.coordinator.entry.entry_id, self.coordinator)
-            time_analyzer = TimeWindowAnalyzer(sensor_helper)
-            
-            # Analyze price windows  
-            price_data = self.coordinator.data.get("price_data", {})
-            price_windows = time_analyzer.analyze_price_windows(price_data, 24)
-            price_situation = time_analyzer.get_current_price_situation(price_windows)
-            
-            # 🔧 FIX: Define buy/sell windows before using them
-            buy_windows = [w for w in price_windows if w.action == 'buy'][:3]
-            sell_windows = [w for w in price_windows if w.action == 'sell'][:3]
-            
-            attributes = {
-                "total_windows": len(price_windows),
-                "current_opportunities": price_situation.get('current_opportunities', 0),
-                "upcoming_opportunities": price_situation.get('upcoming_opportunities', 0),
-                "time_pressure": price_situation.get('time_pressure', 'low'),
-                
-                # Simplified top-3 planner summary
-                "buy_windows_count": len(buy_windows),
-                "sell_windows_count": len(sell_windows),
+        # Analyzed once per refresh by the coordinator; missing only if the analysis failed
+        if "price_windows" not in data:
+            return {"status": "unavailable"}
+        price_windows = data["price_windows"]
+        price_situation = data["price_situation"]
+        
+        if not price_windows:
+            return {
+                "total_windows": 0,
                 "simplified_planner": True,
-                "timing_analysis_version": "top3-1.0"
+                "timing_analysis_version": "top3-1.0",
+                "status": "no_data",
             }
-
-            # Expose top-3 arrays for easy templating
-            try:
-                attributes.update({
-                    "buy_top3_prices": [round(w.price, 4) for w in buy_windows],
-                    "buy_top3_starts": [w.start_time.isoformat() for w in buy_windows],
-                    "sell_top3_prices": [round(w.price, 4) for w in sell_windows],
-                    "sell_top3_starts": [w.start_time.isoformat() for w in sell_windows],
-                })
-            except Exception:
-                pass
-            
-            # Current opportunity details
-            if price_situation.get('immediate_action'):
-                immediate = price_situation['immediate_action']
-                attributes.update({
-                    "current_action": immediate['action'],
-                    "current_price": f"{immediate['price']:.4f}",
-                    "current_urgency": immediate['urgency'],
-                    "time_remaining": f"{immediate['time_remaining']:.1f}h"
-                })
-            
-            # Next opportunity details  
-            if price_situation.get('next_opportunity'):
-                next_opp = price_situation['next_opportunity']
-                attributes.update({
-                    "next_action": next_opp['action'],
-                    "next_price": f"{next_opp['price']:.4f}",
-                    "next_urgency": next_opp['urgency'],
-                    "time_until_start": f"{next_opp['time_until_start']:.1f}h",
-                    "next_duration": f"{next_opp['duration']:.1f}h"
-                })
-            
-            # Window details (up to 5 most relevant)
-            # Note: buy_windows and sell_windows already defined above
-            
-            for i, window in enumerate(buy_windows):
-                # Full timestamp with timezone for debugging
-                attributes[f"buy_window_{i+1}_timestamp"] = window.start_time.strftime("%Y-%m-%d %H:%M:%S %Z")
-                attributes[f"buy_window_{i+1}_start"] = window.start_time.strftime("%H:%M")
-                attributes[f"buy_window_{i+1}_end"] = window.end_time.strftime("%H:%M")
-                attributes[f"buy_window_{i+1}_duration"] = f"{window.duration_hours:.1f}h"
-                attributes[f"buy_window_{i+1}_price"] = f"{window.price:.4f}"
-                attributes[f"buy_window_{i+1}_urgency"] = window.urgency
-                
-                if window.is_current:
-                    attributes[f"buy_window_{i+1}_status"] = "active"
-                elif window.is_upcoming:
-                    attributes[f"buy_window_{i+1}_status"] = "upcoming"
-                else:
-                    attributes[f"buy_window_{i+1}_status"] = "past"
-            
-            for i, window in enumerate(sell_windows):
-                # Full timestamp with timezone for debugging
-                attributes[f"sell_window_{i+1}_timestamp"] = window.start_time.strftime("%Y-%m-%d %H:%M:%S %Z")
-                attributes[f"sell_window_{i+1}_start"] = window.start_time.strftime("%H:%M")
-                attributes[f"sell_window_{i+1}_end"] = window.end_time.strftime("%H:%M")
-                attributes[f"sell_window_{i+1}_duration"] = f"{window.duration_hours:.1f}h"
-                attributes[f"sell_window_{i+1}_price"] = f"{window.price:.4f}"
-                attributes[f"sell_window_{i+1}_urgency"] = window.urgency
-                
-                if window.is_current:
-                    attributes[f"sell_window_{i+1}_status"] = "active"
-                elif window.is_upcoming:
-                    attributes[f"sell_window_{i+1}_status"] = "upcoming"
-                else:
-                    attributes[f"sell_window_{i+1}_status"] = "past"
-            
-            return attributes
+        
+        # Single pass: partition into the first three buy and sell windows, stopping once both are full
+        buy_windows = []
+        sell_windows = []
+        for w in price_windows:
+            if w.action == 'buy':
+                if len(buy_windows) < 3:
+                    buy_windows.append(w)
+            elif w.action == 'sell':
+                if len(sell_windows) < 3:
+                    sell_windows.append(w)
+            if len(buy_windows) == 3 and len(sell_windows) == 3:
+                break
+        
+        attributes = {
+            "total_windows": len(price_windows),
+            "current_opportunities": price_situation.get('current_opportunities', 0),
+            "upcoming_opportunities": price_situation.get('upcoming_opportunities', 0),
+            "time_pressure": price_situation.get('time_pressure', 'low'),
             
-        except Exception as e:
-            return {
-                "error": str(e),
-                "status": "unavailable"
-            }
+            # Simplified top-3 planner summary
+            "buy_windows_count": len(buy_windows),
+            "sell_windows_count": len(sell_windows),
+            "simplified_planner": True,
+            "timing_analysis_version": "top3-1.0"
+        }
+
+        # Expose top-3 arrays for easy templating (filled by the window loops below)
+        buy_top3_prices: list[float] = []
+        buy_top3_starts: list[str] = []
+        sell_top3_prices: list[float] = []
+        sell_top3_starts: list[str] = []
+        attributes["buy_top3_prices"] = buy_top3_prices
+        attributes["buy_top3_starts"] = buy_top3_starts
+        attributes["sell_top3_prices"] = sell_top3_prices
+        attributes["sell_top3_starts"] = sell_top3_starts
+        
+        # Current opportunity details
+        if price_situation.get('immediate_action'):
+            immediate = price_situation['immediate_action']
+            attributes["current_action"] = immediate['action']
+            attributes["current_price"] = round(immediate['price'], 4)
+            attributes["current_urgency"] = immediate['urgency']
+            attributes["time_remaining"] = round(immediate['time_remaining'], 1)
+        
+        # Next opportunity details  
+        if price_situation.get('next_opportunity'):
+            next_opp = price_situation['next_opportunity']
+            attributes["next_action"] = next_opp['action']
+            attributes["next_price"] = round(next_opp['price'], 4)
+            attributes["next_urgency"] = next_opp['urgency']
+            attributes["time_until_start"] = round(next_opp['time_until_start'], 1)
+            attributes["next_duration"] = round(next_opp['duration'], 1)
+        
+        # One clock read for every window status in this render
+        now = get_current_ha_time()
+        _render_windows(attributes, buy_windows, _BUY_PREFIXES, buy_top3_prices, buy_top3_starts, now)
+        _render_windows(attributes, sell_windows, _SELL_PREFIXES, sell_top3_prices, sell_top3_starts, now)
+        
+        return attributes
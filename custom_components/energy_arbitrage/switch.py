@@ -1,6 +1,6 @@
 from __future__ import annotations
 import logging
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
@@ -10,9 +10,45 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import EnergyArbitrageCoordinator
+from .entity import EnergyArbitrageCachedAttributesMixin
 
 _LOGGER = logging.getLogger(__name__)
 
+# Shared read-only fallback for missing nested dicts (never mutated)
+_EMPTY: dict = {}
+
+# Emergency mode attributes do not depend on coordinator data
+_EMERGENCY_ATTRS = {
+    "description": "Emergency mode preserves battery and disables arbitrage",
+    "work_mode": "Zero Export To Load when active",
+}
+
+
+def _enabled_attrs(data: dict | None) -> dict:
+    if not data:
+        return {}
+    decision = data.get("decision") or _EMPTY
+    return {
+        "last_action": decision.get("action", "none"),
+        "last_reason": decision.get("reason", ""),
+    }
+
+
+def _emergency_attrs(data: dict | None) -> dict:
+    return _EMERGENCY_ATTRS
+
+
+def _force_charge_attrs(data: dict | None) -> dict:
+    if not data:
+        return {}
+    battery_level = data.get("battery_level", 0)
+    return {
+        "description": "Force charges battery to 100% regardless of price",
+        "current_battery_level": f"{battery_level:.1f}%",
+        "target_level": "100%",
+        "max_charge_power": f"{data.get('max_battery_power', 5000.0)}W"
+    }
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -21,114 +57,62 @@ async def async_setup_entry(
     coordinator: EnergyArbitrageCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     entities = [
-        EnergyArbitrageEnabledSwitch(coordinator, entry),
-        EnergyArbitrageEmergencyModeSwitch(coordinator, entry),
-        EnergyArbitrageForceChargeSwitch(coordinator, entry),
+        EnergyArbitrageFlagSwitch(
+            coordinator, entry, "enabled", "Arbitrage Enabled", "mdi:power",
+            coordinator.set_enabled, _enabled_attrs,
+        ),
+        EnergyArbitrageFlagSwitch(
+            coordinator, entry, "emergency_mode", "Emergency Mode", "mdi:alert",
+            coordinator.set_emergency_mode, _emergency_attrs,
+        ),
+        EnergyArbitrageFlagSwitch(
+            coordinator, entry, "force_charge", "Force Charge", "mdi:battery-charging-100",
+            coordinator.set_force_charge, _force_charge_attrs,
+        ),
     ]
 
-    async_add_entities(entities)
+    async_add_entities(entities, update_before_add=False)
 
-class EnergyArbitrageBaseSwitch(CoordinatorEntity, SwitchEntity):
+class EnergyArbitrageBaseSwitch(EnergyArbitrageCachedAttributesMixin, CoordinatorEntity, SwitchEntity):
     def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry, switch_type: str) -> None:
         super().__init__(coordinator)
         self._entry = entry
         self._switch_type = switch_type
         self._attr_unique_id = f"{entry.entry_id}_{switch_type}"
         self._attr_has_entity_name = True
-
-    @property
-    def device_info(self) -> dict:
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": "Energy Arbitrage",
-            "manufacturer": "Custom",
-            "model": "Energy Arbitrage System",
-            "sw_version": "1.0.0",
-        }
-
-class EnergyArbitrageEnabledSwitch(EnergyArbitrageBaseSwitch):
-    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator, entry, "enabled")
-        self._attr_name = "Arbitrage Enabled"
-        self._attr_icon = "mdi:power"
+        self._attr_device_info = coordinator.device_info
+
+class EnergyArbitrageFlagSwitch(EnergyArbitrageBaseSwitch):
+    """Coordinator flag switch: state is data[switch_type], toggled through one coordinator setter."""
+
+    def __init__(
+        self,
+        coordinator: EnergyArbitrageCoordinator,
+        entry: ConfigEntry,
+        switch_type: str,
+        name: str,
+        icon: str,
+        setter: Callable[[bool], Awaitable[None]],
+        attr_builder: Callable[[dict | None], dict],
+    ) -> None:
+        super().__init__(coordinator, entry, switch_type)
+        self._attr_name = name
+        self._attr_icon = icon
+        self._setter = setter
+        self._attr_builder = attr_builder
 
     @property
     def is_on(self) -> bool:
-        if not self.coordinator.data:
+        data = self.coordinator.data
+        if not data:
             return False
-        return self.coordinator.data.get("enabled", False)
+        return data.get(self._switch_type, False)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
-        await self.coordinator.set_enabled(True)
+        await self._setter(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        await self.coordinator.set_enabled(False)
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
-            return {}
-        
-        return {
-            "last_action": self.coordinator.data.get("decision", {}).get("action", "none"),
-            "last_reason": self.coordinator.data.get("decision", {}).get("reason", ""),
-        }
-
-class EnergyArbitrageEmergencyModeSwitch(EnergyArbitrageBaseSwitch):
-    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator, entry, "emergency_mode")
-        self._attr_name = "Emergency Mode"
-        self._attr_icon = "mdi:alert"
-
-    @property
-    def is_on(self) -> bool:
-        if not self.coordinator.data:
-            return False
-        return self.coordinator.data.get("emergency_mode", False)
+        await self._setter(False)
 
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        await self.coordinator.set_emergency_mode(True)
-
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        await self.coordinator.set_emergency_mode(False)
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        return {
-            "description": "Emergency mode preserves battery and disables arbitrage",
-            "work_mode": "Zero Export To Load when active",
-        }
-
-
-class EnergyArbitrageForceChargeSwitch(EnergyArbitrageBaseSwitch):
-    def __init__(self, coordinator: EnergyArbitrageCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator, entry, "force_charge")
-        self._attr_name = "Force Charge"
-        self._attr_icon = "mdi:battery-charging-100"
-
-    @property
-    def is_on(self) -> bool:
-        if not self.coordinator.data:
-            return False
-        return self.coordinator.data.get("force_charge", False)
-
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        await self.coordinator.set_force_charge(True)
-
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        await self.coordinator.set_force_charge(False)
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        if not self.coordinator.data:
-            return {}
-        
-        config = self.coordinator.data.get("config", {})
-        battery_level = self.coordinator.data.get("battery_level", 0)
-        
-        return {
-            "description": "Force charges battery to 100% regardless of price",
-            "current_battery_level": f"{battery_level:.1f}%",
-            "target_level": "100%",
-            "max_charge_power": f"{self.coordinator.data.get('max_battery_power', 5000.0)}W"
-        }
\ No newline at end of file
+    def _build_attributes(self) -> dict:
+        return self._attr_builder(self.coordinator.data)